@@ -1,45 +1,195 @@
 import keyboard
-import pyperclip
-import json
-import requests
-from time import sleep
+import itertools
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QTextEdit)
 from PySide6.QtCore import Qt, QTimer, Signal, QObject, QEvent
 from PySide6.QtGui import QIcon
 import sys
 import os
-from typing import Optional, Callable
+from typing import TYPE_CHECKING, Optional, Callable, Dict, Iterable, List, NamedTuple, Tuple
+from improver_core import OpenRouterClient, improve_cached
+from improvement_cache import ImprovementCache
+
+# requests and pyperclip are imported on first use to keep application startup fast
+if TYPE_CHECKING:
+    import requests
+
+_window_icon: Optional[QIcon] = None
+
+
+def window_icon() -> Optional[QIcon]:
+    """Popup icon, read from disk once per process"""
+    global _window_icon
+    if _window_icon is None:
+        icon_path = Path(__file__).parent / "icon.png"
+        if not icon_path.exists():
+            return None
+        _window_icon = QIcon(str(icon_path))
+    return _window_icon
+
+
+class WindowPool(QObject):
+    """
+    Recycles popup windows: a closed window is hidden and kept for the next popup
+    instead of building a new one, at most ``max_open`` windows are shown at once
+    (the oldest is closed to make room) and at most ``max_idle`` closed windows are
+    kept, the rest are deleted. Must be used from the GUI thread.
+    """
+
+    def __init__(self, factory: Callable[[], QMainWindow], max_open: int = 5, max_idle: int = 2,
+                 on_release: Optional[Callable[[QMainWindow], None]] = None):
+        super().__init__()
+        self.factory = factory
+        self.max_open = max_open
+        self.max_idle = max_idle
+        self.on_release = on_release
+        self.open_windows: List[QMainWindow] = []  # Oldest first
+        self.idle_windows: List[QMainWindow] = []
+
+    def acquire(self, keep: Iterable[QMainWindow] = ()) -> QMainWindow:
+        """Window ready to be filled and shown; windows in ``keep`` are never closed to make room"""
+        keep = list(keep)
+        while len(self.open_windows) >= max(1, self.max_open):
+            oldest = next((window for window in self.open_windows if window not in keep), None)
+            if oldest is None:
+                break
+            oldest.close()  # The close event moves it to the idle list
+        if self.idle_windows:
+            window = self.idle_windows.pop()
+        else:
+            window = self.factory()
+            # An event filter rather than a closeEvent override, which PySide handles poorly
+            window.installEventFilter(self)
+        self.open_windows.append(window)
+        return window
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Close:
+            self.release(watched)
+        return False
+
+    def release(self, window: QMainWindow):
+        if window not in self.open_windows:
+            return
+        self.open_windows.remove(window)
+        if self.on_release:
+            self.on_release(window)
+        if len(self.idle_windows) < self.max_idle:
+            self.idle_windows.append(window)
+        else:
+            window.deleteLater()
+
+    @property
+    def live_count(self) -> int:
+        return len(self.open_windows)
+
+    @property
+    def pooled_count(self) -> int:
+        return len(self.idle_windows)
+
 
 class WindowManager(QObject):
-    show_result = Signal(str, str)  # Signal for showing result window (original_text, improved_text)
+    show_result = Signal(str, str, str, str)  # Signal for showing result window (original_text, improved_text, style, tone)
     show_error = Signal(str)  # Signal for showing error window
     show_message = Signal(str)  # Signal for showing message window
+    start_stream = Signal(int, str, str, str)  # Opens a result window that fills in while tokens arrive (stream id, original_text, style, tone)
+    update_stream = Signal(int, str)  # Stream id, improved text received so far
+    finish_stream = Signal(int, str, str)  # Stream id, final improved text, status line (time to first token, cache hit)
+    abort_stream = Signal(int, str)  # Stream id, status line of a failed or cancelled stream
     
-    def __init__(self):
+    def __init__(self, max_open_windows: int = 5):
         super().__init__()
         self.show_result.connect(self._show_result_window, Qt.QueuedConnection)
         self.show_error.connect(self._show_error_window, Qt.QueuedConnection)
-        self.active_windows = []  # Keep track of open windows
+        self.start_stream.connect(self._start_stream_window, Qt.QueuedConnection)
+        self.update_stream.connect(self._update_stream_window, Qt.QueuedConnection)
+        self.finish_stream.connect(self._finish_stream_window, Qt.QueuedConnection)
+        self.abort_stream.connect(self._abort_stream_window, Qt.QueuedConnection)
+        # Open windows are kept by the pools; closed ones are reused for the next popup
+        self.result_pool = WindowPool(self._create_result_window, max_open_windows,
+                                      on_release=self._on_result_window_closed)
+        self.error_pool = WindowPool(ErrorWindow, max_open_windows)
+        # Stream id -> (result window receiving streamed text, (original_text, style, tone))
+        self.streams: Dict[int, Tuple[QMainWindow, tuple]] = {}
+        # Called with (original_text, style, tone, owner) when a result window asks for a fresh improvement
+        self.regenerate_handler: Optional[Callable[[str, str, str, str], None]] = None
+
+    @property
+    def active_windows(self) -> list:
+        return self.result_pool.open_windows + self.error_pool.open_windows
+
+    def window_counts(self) -> Dict[str, int]:
+        """Open and pooled (closed, kept for reuse) popup windows"""
+        return {
+            "live": self.result_pool.live_count + self.error_pool.live_count,
+            "pooled": self.result_pool.pooled_count + self.error_pool.pooled_count,
+        }
         
-    def _show_result_window(self, original_text, improved_text):
+    def _create_result_window(self):
+        window = ResultWindow()
+        window.regenerate_requested.connect(self._on_regenerate_requested)
+        return window
+
+    def _on_regenerate_requested(self, owner, original_text, style, tone):
+        if self.regenerate_handler is not None:
+            self.regenerate_handler(original_text, style, tone, owner)
+
+    def _show_result_window(self, original_text, improved_text, style, tone):
         # Create window in the main thread
-        QApplication.instance().postEvent(self, _ResultWindowEvent(original_text, improved_text))
+        QApplication.instance().postEvent(self, _ResultWindowEvent(original_text, improved_text, style, tone))
         
     def _show_error_window(self, error_message):
         # Create window in the main thread
         QApplication.instance().postEvent(self, _ErrorWindowEvent(error_message))
 
+    def _open_result_window(self, original_text, improved_text, request=None):
+        window = self.result_pool.acquire(keep=[window for window, _ in self.streams.values()])
+        window.set_texts(original_text, improved_text, request)
+        window.show()
+        return window
+
+    def _on_result_window_closed(self, window):
+        # Later tokens of a closed window's stream are dropped
+        for stream_id, (stream_window, _) in list(self.streams.items()):
+            if stream_window is window:
+                del self.streams[stream_id]
+
+    # Stream slots use queued connections, so they already run in the main thread
+    def _start_stream_window(self, stream_id, original_text, style, tone):
+        # Regenerating is offered once the stream has ended
+        window = self._open_result_window(original_text, "")
+        window.set_status("Waiting for the first token...")
+        self.streams[stream_id] = (window, (original_text, style, tone))
+
+    def _update_stream_window(self, stream_id, improved_text):
+        if stream_id in self.streams:
+            self.streams[stream_id][0].set_improved_text(improved_text)
+
+    def _finish_stream_window(self, stream_id, improved_text, status):
+        if stream_id in self.streams:
+            window, request = self.streams.pop(stream_id)
+            window.set_improved_text(improved_text)
+            window.set_status(status)
+            window.set_request(request)
+
+    def _abort_stream_window(self, stream_id, status):
+        """A failed or cancelled stream keeps its partial text under the given status"""
+        if stream_id in self.streams:
+            window, request = self.streams.pop(stream_id)
+            window.set_status(status)
+            window.set_request(request)
+
     def event(self, event):
         if isinstance(event, _ResultWindowEvent):
-            window = ResultWindow(event.original_text, event.improved_text)
-            self.active_windows.append(window)
-            window.show()
+            self._open_result_window(event.original_text, event.improved_text, (event.original_text, event.style, event.tone))
             return True
         elif isinstance(event, _ErrorWindowEvent):
-            window = ErrorWindow(event.error_message)
-            self.active_windows.append(window)
+            window = self.error_pool.acquire()
+            window.set_error_message(event.error_message)
             window.show()
             return True
         return super().event(event)
@@ -48,10 +198,12 @@ class WindowManager(QObject):
 class _ResultWindowEvent(QEvent):
     EVENT_TYPE = QEvent.Type(QEvent.registerEventType())
     
-    def __init__(self, original_text, improved_text):
+    def __init__(self, original_text, improved_text, style, tone):
         super().__init__(_ResultWindowEvent.EVENT_TYPE)
         self.original_text = original_text
         self.improved_text = improved_text
+        self.style = style
+        self.tone = tone
 
 class _ErrorWindowEvent(QEvent):
     EVENT_TYPE = QEvent.Type(QEvent.registerEventType())
@@ -60,26 +212,161 @@ class _ErrorWindowEvent(QEvent):
         super().__init__(_ErrorWindowEvent.EVENT_TYPE)
         self.error_message = error_message
 
+class ImproveResult(NamedTuple):
+    """Outcome of one improvement job"""
+    text: str
+    from_cache: bool = False
+    time_to_first_token: Optional[float] = None  # Seconds, set by streamed requests
+
+    @property
+    def status(self) -> str:
+        """Where the improvement came from, for the result window status line"""
+        if self.from_cache:
+            return "From cache"
+        if self.time_to_first_token is not None:
+            return f"First token after {self.time_to_first_token:.2f} s"
+        return ""
+
+class ImproveJob:
+    """An improvement request running on the improver's worker pool"""
+    def __init__(self, owner: str):
+        self.owner = owner
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future] = None
+
+    def cancel(self):
+        self.cancel_event.set()
+        if self.future:
+            self.future.cancel()
+
 class AcademicImprover:
-    def __init__(self, parent=None):
+    API_URL = OpenRouterClient.API_URL
+
+    def __init__(self, parent=None, session_factory: Optional[Callable[[], "requests.Session"]] = None,
+                 cache_file: Optional[Path] = None):
         self.parent = parent
+        # Keep-alive session so repeated requests skip the TCP/TLS handshake, created on first use
+        self.session_factory = session_factory
+        self._session: Optional["requests.Session"] = None
         self.window_manager = None
         self.api_key = None
         self.model = None
+        # Earlier improvements, opened on first use
+        self.cache_file = cache_file
+        self._cache: Optional[ImprovementCache] = None
+        self._cache_lock = threading.Lock()
+        # Improvements run off the GUI and keyboard hook threads, at most one job per owner window
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="improver")
+        self._jobs: Dict[str, ImproveJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._stream_ids = itertools.count(1)
         
     def set_window_manager(self, manager):
         self.window_manager = manager
+        manager.regenerate_handler = self.regenerate
+
+    def regenerate(self, text: str, style: str, tone: str, owner: str = "popup"):
+        """
+        Improve a popup's text again, bypassing the improvement cache. Each window passes
+        its own owner, so regenerating in one popup doesn't cancel another's.
+        """
+        self.submit(text, style, tone, owner=owner, force=True)
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            if self.session_factory is None:
+                from providers import create_session
+                self.session_factory = create_session
+            self._session = self.session_factory()
+        return self._session
+
+    @property
+    def cache(self) -> Optional[ImprovementCache]:
+        if self.cache_file is None or not self.parent.settings.get("improver_cache", True):
+            return None
+        with self._cache_lock:
+            if self._cache is None:
+                try:
+                    self._cache = ImprovementCache(
+                        self.cache_file, max_entries=self.parent.settings.get("improver_cache_max_entries", 2000)
+                    )
+                except Exception as e:
+                    print(f"Error opening improvement cache: {e}")
+                    self.cache_file = None
+            return self._cache
+
+    def set_cache_max_entries(self, max_entries: int):
+        """Applies the improver_cache_max_entries setting to an open cache"""
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.set_max_entries(max_entries)
+
+    def close(self):
+        """On quit: abandon running requests so their threads don't hold up the exit, then close the cache"""
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            job.cancel()  # Streamed requests check the event between lines
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
+
+    def submit(self, text: str, style: str = "Normal", tone: str = "Friendly", owner: str = "popup",
+               callback: Optional[Callable[[str], None]] = None,
+               on_token: Optional[Callable[[str], None]] = None,
+               timeout: Optional[float] = None, force: bool = False) -> Future:
+        """
+        Run improve_text on a worker thread and return its future.
+        A job that is still running for the same owner is cancelled first.
+        """
+        job = ImproveJob(owner)
+        with self._jobs_lock:
+            previous = self._jobs.get(owner)
+            if previous:
+                previous.cancel()
+            self._jobs[owner] = job
+            job.future = self.executor.submit(
+                self.improve_text, text, style, tone, callback, on_token,
+                cancel_event=job.cancel_event, timeout=timeout, force=force
+            )
+        job.future.add_done_callback(lambda _: self._forget_job(job))
+        return job.future
+
+    def cancel(self, owner: str):
+        with self._jobs_lock:
+            job = self._jobs.pop(owner, None)
+        if job:
+            job.cancel()
 
-    def improve_text(self, text: str, style: str = "Normal", tone: str = "Friendly", callback: Optional[Callable[[str], None]] = None):
+    def _forget_job(self, job: ImproveJob):
+        with self._jobs_lock:
+            if self._jobs.get(job.owner) is job:
+                del self._jobs[job.owner]
+
+    def improve_text(self, text: str, style: str = "Normal", tone: str = "Friendly", callback: Optional[Callable[[str], None]] = None,
+                     on_token: Optional[Callable[[str], None]] = None,
+                     cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = None,
+                     force: bool = False) -> "ImproveResult":
         """
-        Improve the given text using AI while maintaining the original language
+        Improve the given text using AI while maintaining the original language.
+        Returns an ImproveResult with the text and where it came from.
         
         Args:
             text: The text to improve
             style: Writing style (Normal, Corporate, Academic, Friendly)
             tone: Tone of voice (Enthusiastic, Friendly, Confident, Diplomatic)
             callback: Optional callback function to receive the improved text
+            on_token: Optional callback receiving the text generated so far while the response streams
+            cancel_event: Optional event; once set the request is abandoned and CancelledError is raised
+            timeout: Seconds to wait for the whole response (defaults to the improver_timeout setting)
+            force: Ask the AI again even if the improvement is cached, and replace the cached one
         """
+        cancel_event = cancel_event or threading.Event()
+        stream_id = None  # Set when the output streams into a result window
         try:
             # Get API key and model from settings
             if not self.parent.settings.get("openrouter_api_key"):
@@ -87,106 +374,68 @@ class AcademicImprover:
             
             self.api_key = self.parent.settings["openrouter_api_key"]
             self.model = self.parent.settings.get("improver_model", "deepseek/deepseek-r1-distill-llama-70b")
-            
-            # Detect the language of the input text
-            from langdetect import detect
-            detected_lang = detect(text)
-            
-            # Map language codes to full names for clearer instructions
-            lang_map = {
-                'tr': 'Turkish',
-                'en': 'English',
-                'de': 'German',
-                'fr': 'French',
-                'es': 'Spanish',
-                'it': 'Italian',
-                'ru': 'Russian',
-                'ja': 'Japanese',
-                'ko': 'Korean',
-                'zh-cn': 'Chinese'
-            }
-            
-            language = lang_map.get(detected_lang, 'the original language')
-            
-            # Prepare system message based on style, tone and detected language
-            system_message = f"You are an AI writing assistant. Please improve the given text while keeping it in {language}. "
-            system_message += f"Rewrite the text in a {style.lower()} style with a {tone.lower()} tone. "
-            system_message += "DO NOT translate the text, only improve its writing style and clarity in the same language. "
-            
-            if style == "Corporate":
-                system_message += f"Use professional business language and formal expressions in {language}. "
-            elif style == "Academic":
-                system_message += f"Use scholarly language, technical terms, and formal academic writing conventions in {language}. "
-            elif style == "Friendly":
-                system_message += f"Use casual, warm, and approachable language in {language}. "
-                
-            if tone == "Enthusiastic":
-                system_message += "Express excitement and positivity in the writing."
-            elif tone == "Confident":
-                system_message += "Use assertive and authoritative language."
-            elif tone == "Diplomatic":
-                system_message += "Use tactful, balanced, and considerate language."
-
-            # Make API call to OpenRouter
-            response = requests.post(
-                url="https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "http://localhost:3000",
-                    "X-Title": "AI Writing Assistant"
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_message},
-                        {"role": "user", "content": f"Please improve this text while keeping it in the same language:\n\n{text}"}
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 4000
-                }
+            if timeout is None:
+                timeout = self.parent.settings.get("improver_timeout", 60)
+            if cancel_event.is_set():
+                raise CancelledError()
+
+            # Stream into a result window unless the caller handles the output itself
+            stream = self.parent.settings.get("stream_improver", True)
+            streaming_window = stream and on_token is None and callback is None and self.window_manager is not None
+            if streaming_window:
+                stream_id = next(self._stream_ids)
+                self.window_manager.start_stream.emit(stream_id, text, style, tone)
+                on_token = partial(self.window_manager.update_stream.emit, stream_id)
+
+            # Prompt construction and the OpenRouter request are shared with the batch improver
+            client = OpenRouterClient(self.api_key, self.model, session_factory=lambda: self.session,
+                                      api_url=self.API_URL)
+            improved_text, from_cache = improve_cached(
+                client, text, style, tone, cache=self.cache, force=force,
+                on_token=on_token if stream else None, cancel_event=cancel_event, timeout=timeout
             )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if 'choices' in result and len(result['choices']) > 0:
-                improved_text = result['choices'][0]['message']['content'].strip()
-                # Remove any quotes and cleanup the text
-                if improved_text.startswith('"') and improved_text.endswith('"'):
-                    improved_text = improved_text[1:-1].strip()
-                
-                # Verify that the improved text is in the same language
-                improved_lang = detect(improved_text)
-                if improved_lang != detected_lang:
-                    raise ValueError(f"The AI generated text in a different language. Please try again.")
-                
-                # If callback is provided, use it, otherwise show in result window
-                if callback:
-                    callback(improved_text)
-                else:
-                    # Show results in popup window
-                    self.window_manager.show_result.emit(text, improved_text)
+            # Returned with the job rather than kept on the improver, which runs jobs in parallel
+            result = ImproveResult(improved_text, from_cache, client.last_time_to_first_token)
+
+            # If callback is provided, use it, otherwise show in result window
+            if callback:
+                callback(improved_text)
+            elif streaming_window:
+                self.window_manager.finish_stream.emit(stream_id, improved_text, result.status)
             else:
-                raise ValueError("Couldn't get a proper response from AI")
+                # Show results in popup window
+                self.window_manager.show_result.emit(text, improved_text, style, tone)
+            return result
 
+        except CancelledError:
+            if stream_id is not None:
+                self.window_manager.abort_stream.emit(stream_id, "Cancelled")
+            raise
         except Exception as e:
             error_msg = str(e)
+            import requests
+            if isinstance(e, requests.Timeout):
+                error_msg = f"The AI service did not answer within {timeout} seconds."
+            if stream_id is not None:
+                self.window_manager.abort_stream.emit(stream_id, "Failed, see the error message")
             if self.window_manager:
                 self.window_manager.show_error.emit(f"Error improving text: {error_msg}")
             raise
 
 class ResultWindow(QMainWindow):
-    def __init__(self, original_text, improved_text):
+    regenerate_requested = Signal(str, str, str, str)  # owner, original_text, style, tone
+
+    def __init__(self, original_text="", improved_text=""):
         super().__init__()
+        self.request = None  # (original_text, style, tone) that produced the shown result
         self.setWindowTitle("Academic Text Improvement")
         self.setFixedSize(600, 400)
         self.setWindowFlags(Qt.WindowStaysOnTopHint)  # Her zaman üstte
         
         # Set window icon
-        icon_path = Path(__file__).parent / "icon.png"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        icon = window_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
 
         # Ana widget
         central_widget = QWidget()
@@ -195,7 +444,7 @@ class ResultWindow(QMainWindow):
         
         # Orijinal metin
         layout.addWidget(QLabel("Original Text:"))
-        original_textedit = QTextEdit()
+        self.original_textedit = original_textedit = QTextEdit()
         original_textedit.setPlainText(original_text)
         original_textedit.setReadOnly(True)
         original_textedit.setMaximumHeight(100)
@@ -249,12 +498,70 @@ class ResultWindow(QMainWindow):
             }
         """)
         copy_button.clicked.connect(self.copy_improved_text)
-        layout.addWidget(copy_button)
+
+        # Yeniden oluştur butonu: önbelleği atlayarak metni tekrar iyileştirir
+        self.regenerate_button = QPushButton("Regenerate")
+        self.regenerate_button.setToolTip("Ask the AI for a new version instead of the cached one")
+        self.regenerate_button.setStyleSheet("""
+            QPushButton {
+                background-color: #757575;
+                color: white;
+                border: none;
+                padding: 8px;
+                border-radius: 4px;
+                min-width: 100px;
+            }
+            QPushButton:hover {
+                background-color: #616161;
+            }
+            QPushButton:pressed {
+                background-color: #424242;
+            }
+            QPushButton:disabled {
+                background-color: #bdbdbd;
+            }
+        """)
+        self.regenerate_button.setEnabled(False)
+        self.regenerate_button.clicked.connect(self.request_regenerate)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(copy_button)
+        button_layout.addWidget(self.regenerate_button)
+        layout.addLayout(button_layout)
         
         # Pencereyi ekranın ortasına konumlandır
         self.center_on_screen()
         
+    def set_texts(self, original_text, improved_text, request=None):
+        """Refill a recycled window for a new result"""
+        self.original_textedit.setPlainText(original_text)
+        self.improved_textedit.setPlainText(improved_text)
+        self.status_label.setText("")
+        self.set_request(request)
+        self.center_on_screen()
+
+    def set_request(self, request):
+        """(original_text, style, tone) to improve again on Regenerate; None disables the button"""
+        self.request = request
+        self.regenerate_button.setEnabled(request is not None)
+
+    def request_regenerate(self):
+        if self.request is None:
+            return
+        request, self.request = self.request, None
+        # The new result opens in a fresh window (usually this one, recycled)
+        self.close()
+        self.regenerate_requested.emit(f"popup-{id(self)}", *request)
+
+    def set_improved_text(self, improved_text):
+        self.improved_textedit.setPlainText(improved_text)
+
+    def set_status(self, message):
+        self.status_label.setText(message)
+
     def copy_improved_text(self):
+        import pyperclip
+
         improved_text = self.improved_textedit.toPlainText()
         pyperclip.copy(improved_text)
         self.status_label.setText("Text copied to clipboard!")
@@ -269,16 +576,16 @@ class ResultWindow(QMainWindow):
         self.move(x, y)
 
 class ErrorWindow(QMainWindow):
-    def __init__(self, error_message):
+    def __init__(self, error_message=""):
         super().__init__()
         self.setWindowTitle("Error")
         self.setFixedSize(400, 200)
         self.setWindowFlags(Qt.WindowStaysOnTopHint)
         
         # Set window icon
-        icon_path = Path(__file__).parent / "icon.png"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        icon = window_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -287,7 +594,7 @@ class ErrorWindow(QMainWindow):
         error_label = QLabel("Error occurred:")
         layout.addWidget(error_label)
         
-        error_text = QTextEdit()
+        self.error_text = error_text = QTextEdit()
         error_text.setPlainText(error_message)
         error_text.setReadOnly(True)
         error_text.setStyleSheet("""
@@ -321,6 +628,11 @@ class ErrorWindow(QMainWindow):
         layout.addWidget(close_button)
         
         self.center_on_screen()
+
+    def set_error_message(self, error_message):
+        """Refill a recycled window for a new error"""
+        self.error_text.setPlainText(error_message)
+        self.center_on_screen()
         
     def center_on_screen(self):
         screen = QApplication.primaryScreen().geometry()
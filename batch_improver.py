@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from improvement_cache import ImprovementCache
+from improver_core import OpenRouterClient, RateLimitError, improve_cached
+
+OUTPUT_MARKER = ".improved"
+CHECKPOINT_SUFFIX = ".checkpoint.jsonl"
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Paragraphs are separated by blank lines"""
+    return [paragraph.strip() for paragraph in re.split(r"\n\s*\n", text.strip()) if paragraph.strip()]
+
+
+def output_path(path: Path) -> Path:
+    """notes.md -> notes.improved.md, next to the input"""
+    return path.with_name(f"{path.stem}{OUTPUT_MARKER}{path.suffix}")
+
+
+def checkpoint_path(path: Path) -> Path:
+    return path.with_name(f"{output_path(path).name}{CHECKPOINT_SUFFIX}")
+
+
+def find_inputs(targets: Iterable[str], patterns: Iterable[str] = ("*.txt", "*.md")) -> List[Path]:
+    """Files given directly, plus files matching the patterns in given directories (recursive)"""
+    files: List[Path] = []
+    for target in map(Path, targets):
+        if target.is_dir():
+            candidates = sorted({path for pattern in patterns for path in target.rglob(pattern)})
+        else:
+            candidates = [target]
+        files.extend(path for path in candidates if OUTPUT_MARKER not in path.suffixes)
+    return files
+
+
+class RateLimitGate:
+    """A 429 on any worker holds back every worker until the server's Retry-After has passed"""
+
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def wait(self):
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+
+class BatchImprover:
+    """
+    Runs the paragraphs of document files through the improver with bounded concurrency.
+
+    Every finished paragraph is appended to a checkpoint file next to the input, keyed by
+    a hash of the paragraph, model, style and tone, so an interrupted run resumes where it
+    stopped. When all paragraphs of a file are done the result is written (atomically)
+    to <name>.improved<suffix> and the checkpoint is removed; files whose output is newer
+    than the input are skipped. With an improvement cache, paragraphs improved before
+    (by an earlier run or in the app) are not sent again unless ``force`` is set.
+    """
+
+    def __init__(self, client: OpenRouterClient, style: str = "Normal", tone: str = "Friendly",
+                 concurrency: int = 2, timeout: Optional[float] = 60, max_retries: int = 5,
+                 log: Callable[[str], None] = print, cache: Optional[ImprovementCache] = None,
+                 force: bool = False):
+        self.client = client
+        self.style = style
+        self.tone = tone
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.log = log
+        self.cache = cache
+        self.force = force
+        self.gate = RateLimitGate()
+
+    def paragraph_key(self, paragraph: str) -> str:
+        data = "\0".join((self.client.model, self.style, self.tone, paragraph))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def improve_paragraph(self, paragraph: str) -> str:
+        """Improve one paragraph, retrying rate limits, network and server errors with backoff"""
+        import requests
+
+        for attempt in range(self.max_retries + 1):
+            self.gate.wait()
+            try:
+                return improve_cached(self.client, paragraph, self.style, self.tone, cache=self.cache,
+                                      force=self.force, timeout=self.timeout)[0]
+            except RateLimitError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else self.backoff(attempt)
+                self.log(f"Rate limited, pausing all requests for {delay:.1f} s")
+                self.gate.pause(delay)
+            except requests.RequestException as e:
+                # Connection problems, timeouts and server errors are worth another try
+                server_error = e.response is not None and e.response.status_code >= 500
+                transient = isinstance(e, (requests.ConnectionError, requests.Timeout)) or server_error
+                if not transient or attempt == self.max_retries:
+                    raise
+                delay = self.backoff(attempt)
+                self.log(f"Request failed ({e}), retrying in {delay:.1f} s")
+                time.sleep(delay)
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        return min(60.0, 2.0 * 2 ** attempt) * random.uniform(0.8, 1.2)
+
+    def load_checkpoint(self, path: Path) -> Dict[str, str]:
+        done: Dict[str, str] = {}
+        try:
+            with open(checkpoint_path(path), encoding="utf-8") as checkpoint:
+                for line in checkpoint:
+                    try:
+                        entry = json.loads(line)
+                        done[entry["key"]] = entry["improved"]
+                    except (ValueError, KeyError):
+                        continue  # Partly written last line of an interrupted run
+        except FileNotFoundError:
+            pass
+        return done
+
+    def process_file(self, path: Path) -> Tuple[int, int]:
+        """Improve the paragraphs of one file; returns (improved, failed) paragraph counts"""
+        output = output_path(path)
+        if output.exists() and output.stat().st_mtime >= path.stat().st_mtime and not checkpoint_path(path).exists():
+            self.log(f"{path}: {output.name} is up to date")
+            return 0, 0
+
+        paragraphs = split_paragraphs(path.read_text(encoding="utf-8"))
+        keys = [self.paragraph_key(paragraph) for paragraph in paragraphs]
+        done = self.load_checkpoint(path)
+        todo = list(dict.fromkeys(key for key in keys if key not in done))  # Identical paragraphs are sent once
+        paragraph_of = dict(zip(keys, paragraphs))
+        if done:
+            self.log(f"{path}: resuming, {sum(key in done for key in keys)} of {len(paragraphs)} paragraphs already done")
+
+        failed = 0
+        if todo:
+            write_lock = threading.Lock()
+            with open(checkpoint_path(path), "a", encoding="utf-8") as checkpoint, \
+                    ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = {pool.submit(self.improve_paragraph, paragraph_of[key]): key for key in todo}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        done[key] = future.result()
+                    except Exception as e:
+                        failed += 1
+                        self.log(f"{path}: paragraph failed: {e}")
+                        continue
+                    with write_lock:
+                        checkpoint.write(json.dumps({"key": key, "improved": done[key]}, ensure_ascii=False) + "\n")
+                        checkpoint.flush()
+
+        if failed:
+            self.log(f"{path}: {failed} paragraphs failed, run again to resume")
+            return sum(key in done for key in keys), failed
+
+        self.write_output(output, "\n\n".join(done[key] for key in keys) + "\n")
+        checkpoint_path(path).unlink(missing_ok=True)
+        self.log(f"{path}: wrote {output}")
+        return len(paragraphs), 0
+
+    @staticmethod
+    def write_output(path: Path, text: str):
+        fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent.resolve())
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(text)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def run(self, files: List[Path]) -> Tuple[int, int, int]:
+        """
+        Process files one after another; a file that can't be read or written is skipped.
+        Returns (paragraphs improved, paragraphs failed, files failed).
+        """
+        improved = failed = failed_files = 0
+        for path in files:
+            try:
+                file_improved, file_failed = self.process_file(path)
+            except (OSError, UnicodeDecodeError) as e:
+                failed_files += 1
+                self.log(f"{path}: skipped, {e}")
+                continue
+            improved += file_improved
+            failed += file_failed
+        return improved, failed, failed_files
@@ -0,0 +1,73 @@
+"""
+Latency of a translation while the primary provider is down, with and without a
+circuit breaker. DeepL points at a stub that answers 429 (quota / rate limit) to every
+request and falls back to a healthy stub endpoint standing in for Google.
+
+    python benchmarks/circuit_breaker.py --requests 20
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import deepl.http_client
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from circuit_breaker import ProviderHealth  # noqa: E402
+from providers import ProviderRegistry  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+
+def translate(primary, fallback):
+    """The app's fallback order: primary first, secondary once the primary has failed"""
+    try:
+        return primary()
+    except Exception:
+        return fallback()
+
+
+def measure(func, count: int):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    # Keeps the run short; with the library default (5 retries) every failing call takes ~15 s
+    deepl.http_client.max_network_retries = 1
+
+    broken = start_stub_server(fail_rate=1.0, fail_status=429, retry_after=0)
+    healthy = start_stub_server(token_delay=0)
+    registry = ProviderRegistry(deepl_server_url=f"http://127.0.0.1:{broken.server_address[1]}")
+    fallback_url = f"http://127.0.0.1:{healthy.server_address[1]}/translate"
+
+    primary = lambda: registry.deepl("stub:fx").translate_text("hello", target_lang="DE")
+    fallback = lambda: registry.session.post(fallback_url, json={"text": "hello"}).json()
+    health = ProviderHealth(failure_threshold=3, base_delay=60)
+
+    cases = {
+        "fallback only": lambda: translate(primary, fallback),
+        "circuit breaker": lambda: translate(health.guard("DeepL", primary), fallback),
+    }
+
+    print(f"{'case':<20}{'median ms':>12}{'max ms':>12}")
+    for name, func in cases.items():
+        median, worst = measure(func, args.requests)
+        print(f"{name:<20}{median:>12.2f}{worst:>12.2f}")
+    print(*health.describe(), sep="\n")
+
+    registry.close()
+    broken.shutdown()
+    healthy.shutdown()
+
+
+if __name__ == "__main__":
+    main()
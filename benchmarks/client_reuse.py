@@ -0,0 +1,60 @@
+"""
+Per-request latency with fresh clients (old behaviour) vs ProviderRegistry clients.
+
+    python benchmarks/client_reuse.py --requests 200
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import deepl
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from providers import ProviderRegistry  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+
+def measure(func, count: int):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_stub_server(token_delay=0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    chat_url = f"{base_url}/api/v1/chat/completions"
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "hello"}]}
+
+    registry = ProviderRegistry(deepl_server_url=base_url)
+
+    cases = {
+        "openrouter  requests.post": lambda: requests.post(chat_url, json=payload).json(),
+        "openrouter  shared session": lambda: registry.session.post(chat_url, json=payload).json(),
+        "deepl       new Translator": lambda: deepl.Translator("stub:fx", server_url=base_url)
+        .translate_text("hello", target_lang="DE"),
+        "deepl       registry client": lambda: registry.deepl("stub:fx").translate_text("hello", target_lang="DE"),
+    }
+
+    print(f"{'case':<30}{'median ms':>12}{'p95 ms':>12}")
+    for name, func in cases.items():
+        func()  # Warm-up
+        median, p95 = measure(func, args.requests)
+        print(f"{name:<30}{median:>12.2f}{p95:>12.2f}")
+
+    registry.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Time to first token vs. total time for the improver's OpenRouter client against the local SSE stub.
+
+    python benchmarks/improver_streaming.py --tokens 50 --token-delay 0.05
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from improver_core import OpenRouterClient  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=50)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    tokens = [f"word{i} " for i in range(args.tokens)]
+    server = start_stub_server(token_delay=args.token_delay, stream_tokens=tokens)
+    improver = OpenRouterClient("stub", "stub",
+                                api_url=f"http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions")
+
+    start = time.perf_counter()
+    improver.complete("system", "text")
+    blocking = time.perf_counter() - start
+
+    received = []
+    start = time.perf_counter()
+    result = improver.complete("system", "text", on_token=received.append)
+    streaming = time.perf_counter() - start
+
+    assert result == "".join(tokens), "streamed text does not match the stub response"
+    print(f"blocking request:     first text after {blocking * 1000:8.1f} ms")
+    print(f"streaming request:    first text after {improver.last_time_to_first_token * 1000:8.1f} ms "
+          f"(complete after {streaming * 1000:.1f} ms, {len(received)} updates)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Language detection cost in detail mode: langdetect on every 5-word chunk (old behaviour)
+vs. one memoized, script-aware detection per selection.
+
+    python benchmarks/language_detection.py --rounds 20
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from langdetect import detect
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import language_detection  # noqa: E402
+
+SAMPLES = {
+    "en": "The quick brown fox jumps over the lazy dog while the farmer watches from the porch "
+          "and wonders whether the harvest will be ready before the first frost of the season arrives.",
+    "de": "Der schnelle braune Fuchs springt über den faulen Hund, während der Bauer von der Veranda "
+          "aus zusieht und sich fragt, ob die Ernte vor dem ersten Frost der Saison fertig sein wird.",
+    "ru": "Быстрая коричневая лиса прыгает через ленивую собаку, пока фермер смотрит с крыльца "
+          "и думает, будет ли урожай готов до первых заморозков этого сезона.",
+    "ja": "素早い茶色の狐が怠け者の犬を飛び越え、農夫はポーチから眺めながら、今季の初霜の前に収穫が間に合うかどうか考えている。",
+}
+
+
+def chunks_of(text, size=5):
+    words = text.split()
+    return [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+
+def old_behaviour(text, target):
+    return [detect(chunk) == target for chunk in chunks_of(text)]
+
+
+def new_behaviour_cold(text, target):
+    language_detection.detect_language.cache_clear()
+    return language_detection.is_language(text, target)
+
+
+def new_behaviour_warm(text, target):
+    return language_detection.is_language(text, target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--target", default="tr")
+    args = parser.parse_args()
+
+    detect("warm up")  # Load the langdetect profiles outside the measurement
+
+    cases = (
+        ("per chunk langdetect", old_behaviour),
+        ("per selection, cold", new_behaviour_cold),
+        ("per selection, memoized", new_behaviour_warm),
+    )
+    for name, func in cases:
+        language_detection.detect_language.cache_clear()
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for text in SAMPLES.values():
+                func(text, args.target)
+        elapsed = (time.perf_counter() - start) * 1000 / (args.rounds * len(SAMPLES))
+        print(f"{name:<26}{elapsed:10.2f} ms per selection")
+
+
+if __name__ == "__main__":
+    main()
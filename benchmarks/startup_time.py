@@ -0,0 +1,75 @@
+"""
+Startup cost of the application.
+
+Import time is measured with ``python -X importtime -c "import main"``; time to tray starts
+main.py with SCREEN_TRANSLATOR_STARTUP_PROBE set, which makes it exit as soon as the tray
+icon is shown and the event loop is running.
+
+    python benchmarks/startup_time.py --runs 5
+    python benchmarks/startup_time.py --imports-only
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile():
+    """(total microseconds for main, [(cumulative microseconds, module)] imported directly by main)"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    total, children = 0, []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        if module == "main":
+            total = cumulative
+        elif depth == 3:  # Imported directly by main
+            children.append((cumulative, module))
+    return total, sorted(children, reverse=True)
+
+
+def time_to_tray() -> float:
+    env = dict(os.environ, SCREEN_TRANSLATOR_STARTUP_PROBE="1")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:
+        if line.strip() == "tray-ready":
+            elapsed = time.perf_counter() - start
+            process.wait()
+            return elapsed
+    raise RuntimeError(f"main.py exited with code {process.wait()} before the tray appeared")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--imports-only", action="store_true")
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [total for total, _ in profiles]
+    print(f"import main: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+    for cumulative, module in profiles[-1][1][:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    if not args.imports_only:
+        timings = [time_to_tray() for _ in range(args.runs)]
+        print(f"time to tray: median {statistics.median(timings) * 1000:.1f} ms, "
+              f"min {min(timings) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Local HTTP stub that mimics the provider endpoints used by the app, for benchmarks.
+
+    python benchmarks/stub_server.py --port 8765 --fail-rate 0.5 --fail-status 429
+
+Fault injection settings are class attributes of the handler, so a running stub can
+be switched into and out of an outage: server.RequestHandlerClass.fail_rate = 1.0
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    latency = 0.0  # Simulated server processing time in seconds
+    token_delay = 0.02  # Delay between streamed tokens in seconds
+    stream_tokens = ["This ", "is ", "a ", "streamed ", "stub ", "response."]
+    stream_error = None  # Message of an error event sent after the first token, like a mid-stream provider failure
+    fail_rate = 0.0  # Fraction of POST requests answered with fail_status
+    fail_status = 503
+    retry_after = 1  # Retry-After header (seconds) sent with 429 and 503 faults
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_event_stream(self):
+        """OpenRouter style server-sent events, one chat completion delta per token"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunk(b": OPENROUTER PROCESSING\n\n")
+        for i, token in enumerate(self.stream_tokens):
+            time.sleep(self.token_delay)
+            if i == 1 and self.stream_error:
+                event = {"error": {"code": 502, "message": self.stream_error}}
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                break
+            event = {"choices": [{"delta": {"content": token}}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self._send_json({"ok": True})
+
+    def _inject_fault(self) -> bool:
+        if not self.fail_rate or random.random() >= self.fail_rate:
+            return False
+        body = json.dumps({"message": "Injected fault"}).encode("utf-8")
+        self.send_response(self.fail_status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.fail_status in (429, 503):
+            self.send_header("Retry-After", str(self.retry_after))
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+
+    def do_POST(self):
+        body = self._read_body()
+        time.sleep(self.latency)
+        if self._inject_fault():
+            return
+        if self.path.endswith("/translate"):
+            # DeepL style response
+            self._send_json({"translations": [{"detected_source_language": "EN", "text": "stub", "billed_characters": 4}]})
+        elif self.path.endswith("/chat/completions"):
+            # OpenRouter style response
+            if json.loads(body or b"{}").get("stream"):
+                self._send_event_stream()
+            else:
+                # Same generation time as the streamed response, delivered all at once
+                time.sleep(self.token_delay * len(self.stream_tokens))
+                self._send_json({"choices": [{"message": {"content": "".join(self.stream_tokens)}}]})
+        else:
+            self._send_json({"received": len(body)})
+
+
+def start_stub_server(port: int = 0, latency: float = 0.0, **options) -> ThreadingHTTPServer:
+    """Start the stub in a daemon thread; port 0 picks a free port"""
+    handler = type("Handler", (StubHandler,), {"latency": latency, **options})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    args = parser.parse_args()
+    server = start_stub_server(args.port, args.latency, fail_rate=args.fail_rate, fail_status=args.fail_status)
+    print(f"Stub server listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Health of one provider. After ``failure_threshold`` consecutive failures the circuit
+    opens and calls fail immediately. Once the backoff has passed a single probe call is
+    let through (half-open): success closes the circuit, failure opens it again with
+    twice the backoff (plus jitter, so parallel clients don't retry in lockstep).
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, base_delay: float = 5.0,
+                 max_delay: float = 300.0, jitter: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self.trips = 0  # Consecutive openings, drives the backoff
+        self.retry_at = 0.0
+        self.last_error = ""
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def configure(self, **options):
+        """Update thresholds and delays in place; the current state is kept"""
+        with self._lock:
+            for name, value in options.items():
+                setattr(self, name, value)
+
+    def backoff(self) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, self.trips - 1))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected; doesn't use up the half-open probe"""
+        with self._lock:
+            if self.state == OPEN:
+                return self.clock() < self.retry_at
+            return self.state == HALF_OPEN and self._probing
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and self.clock() >= self.retry_at:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.trips = 0
+            self._probing = False
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            self._probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.trips += 1
+                self.state = OPEN
+                self.retry_at = self.clock() + self.backoff()
+
+    def call(self, func: Callable[[], T]) -> T:
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} is unavailable, retrying in {self.retry_in():.0f} s")
+        try:
+            result = func()
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def retry_in(self) -> float:
+        return max(0.0, self.retry_at - self.clock())
+
+    def describe(self) -> str:
+        if self.state == OPEN and self.retry_in() > 0:
+            return f"{self.name}: unavailable, retry in {self.retry_in():.0f} s ({self.last_error})"
+        if self.state != CLOSED or self.failures:
+            return f"{self.name}: recovering ({self.failures} recent failures)"
+        return f"{self.name}: OK"
+
+
+class ProviderHealth:
+    """One circuit breaker per provider, created on first use"""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self.breakers:
+                self.breakers[provider] = CircuitBreaker(provider, **self.breaker_options)
+            return self.breakers[provider]
+
+    def configure(self, **breaker_options):
+        """Change breaker options (e.g. failure_threshold, base_delay) for existing and future breakers"""
+        with self._lock:
+            self.breaker_options.update(breaker_options)
+            breakers = list(self.breakers.values())
+        for breaker in breakers:
+            breaker.configure(**breaker_options)
+
+    def guard(self, provider: str, func: Callable[[], T]) -> Callable[[], T]:
+        """func wrapped so its outcome feeds the provider's breaker"""
+        return lambda: self.breaker(provider).call(func)
+
+    def is_open(self, provider: str) -> bool:
+        return self.breaker(provider).is_open()
+
+    def describe(self) -> List[str]:
+        with self._lock:
+            breakers = list(self.breakers.values())
+        return [breaker.describe() for breaker in breakers]
@@ -0,0 +1,54 @@
+from typing import Callable, Optional
+from PySide6.QtCore import QObject, QTimer
+import keyboard
+
+
+class ClipboardCapture(QObject):
+    """
+    Copies the current selection and hands over the new clipboard text as soon as
+    the clipboard reports a change, instead of sleeping for a fixed time.
+
+    If nothing changes before the deadline the callback gets None: nothing was selected,
+    or the selection was already on the clipboard. Callers that want the clipboard text
+    in that case pass ``read_on_timeout``. Must be used from the GUI thread.
+    """
+
+    def __init__(self, clipboard, timeout_ms: int = 500, parent=None):
+        super().__init__(parent)
+        self.clipboard = clipboard
+        self.timeout_ms = timeout_ms
+        self.active = False  # True while waiting for the copied text
+        self._callback: Optional[Callable[[Optional[str]], None]] = None
+        self._read_on_timeout = False
+
+        self._deadline = QTimer(self)
+        self._deadline.setSingleShot(True)
+        self._deadline.timeout.connect(self._on_timeout)
+
+    def capture(self, callback: Callable[[Optional[str]], None], read_on_timeout: bool = False) -> bool:
+        """
+        Send ctrl+c and call ``callback(text)`` once; text is None if the clipboard didn't
+        change in time, unless ``read_on_timeout`` is set. Returns False if a capture is
+        already running.
+        """
+        if self.active:
+            return False
+        self.active = True
+        self._callback = callback
+        self._read_on_timeout = read_on_timeout
+        self.clipboard.dataChanged.connect(self._finish)
+        self._deadline.start(self.timeout_ms)
+        keyboard.send('ctrl+c')
+        return True
+
+    def _on_timeout(self):
+        self._finish(timed_out=True)
+
+    def _finish(self, timed_out: bool = False):
+        if not self.active:
+            return
+        self.active = False
+        self._deadline.stop()
+        self.clipboard.dataChanged.disconnect(self._finish)
+        callback, self._callback = self._callback, None
+        callback(None if timed_out and not self._read_on_timeout else self.clipboard.text())
@@ -0,0 +1,144 @@
+import threading
+from bisect import bisect_left
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyHistogram:
+    """
+    Bucketed latency histogram (25 ms to ~2.5 min, 25% wide buckets). Counts are halved
+    once ``max_samples`` is reached so the percentiles follow recent network conditions.
+    """
+    BOUNDS: List[float] = [0.025 * 1.25 ** i for i in range(40)]
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.counts[bisect_left(self.BOUNDS, seconds)] += 1
+            self.total += 1
+            if self.total >= self.max_samples:
+                self.counts = [count // 2 for count in self.counts]
+                self.total = sum(self.counts)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of samples, None if empty"""
+        with self._lock:
+            if not self.total:
+                return None
+            threshold = fraction * self.total
+            seen = 0
+            for i, count in enumerate(self.counts):
+                seen += count
+                if seen >= threshold:
+                    return self.BOUNDS[min(i, len(self.BOUNDS) - 1)]
+        return self.BOUNDS[-1]
+
+
+class HedgedCaller:
+    """
+    Runs a request on the primary provider and, if it hasn't answered within that
+    provider's ``percentile`` latency, fires the secondary as well. The first valid
+    answer wins; the other request is cancelled if it hasn't started, otherwise its
+    result is ignored. A failing primary starts the secondary right away.
+    """
+
+    def __init__(self, percentile: float = 0.95, min_samples: int = 20,
+                 default_delay: float = 1.0, max_workers: int = 8):
+        self.percentile = percentile
+        self.min_samples = min_samples  # Below this the default delay is used
+        self.default_delay = default_delay
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self.hedged = 0  # Requests where the secondary was fired
+        self.secondary_wins = 0
+
+    def histogram(self, provider: str) -> LatencyHistogram:
+        with self._lock:
+            if provider not in self.histograms:
+                self.histograms[provider] = LatencyHistogram()
+            return self.histograms[provider]
+
+    def timed(self, provider: str, func: Callable[[], T]) -> T:
+        """Call func and record its latency if it succeeds"""
+        start = perf_counter()
+        result = func()
+        self.histogram(provider).record(perf_counter() - start)
+        return result
+
+    def hedge_delay(self, provider: str) -> float:
+        histogram = self.histogram(provider)
+        if histogram.total < self.min_samples:
+            return self.default_delay
+        return histogram.percentile(self.percentile)
+
+    def call(self, primary: Tuple[str, Callable[[], T]], secondary: Optional[Tuple[str, Callable[[], T]]] = None,
+             is_valid: Callable[[T], bool] = lambda result: result is not None,
+             hedge: bool = True) -> Tuple[T, str]:
+        """
+        ``(provider name, func)`` pairs; with ``hedge=False`` the secondary is only a
+        fallback for a failed or invalid primary answer. Returns the winning result and
+        the name of the provider that produced it.
+        """
+        primary_name, primary_func = primary
+        if secondary is None:
+            return self.timed(primary_name, primary_func), primary_name
+
+        secondary_name, secondary_func = secondary
+        futures: Dict[Future, str] = {
+            self.executor.submit(self.timed, primary_name, primary_func): primary_name
+        }
+        done, _ = wait(futures, timeout=self.hedge_delay(primary_name) if hedge else None)
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                for future in done:
+                    name = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"{name} translation error: {e}")
+                        error = e
+                        continue
+                    if is_valid(result):
+                        if name == secondary_name:
+                            with self._lock:
+                                self.secondary_wins += 1
+                        return result, name
+
+                if secondary_func is not None:
+                    # Primary is slow or failed: race the secondary against it
+                    with self._lock:
+                        self.hedged += 1
+                    futures[self.executor.submit(self.timed, secondary_name, secondary_func)] = secondary_name
+                    secondary_func = None
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        finally:
+            for future in futures:
+                future.cancel()
+
+        if error is not None:
+            raise error
+        raise ValueError("No provider returned a usable result")
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            names = list(self.histograms)
+            stats = {"hedged": self.hedged, "secondary_wins": self.secondary_wins}
+        stats["p50"] = {name: self.histogram(name).percentile(0.5) for name in names}
+        stats[f"p{int(self.percentile * 100)}"] = {name: self.histogram(name).percentile(self.percentile)
+                                                   for name in names}
+        return stats
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,119 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from translation_cache import normalize_text
+
+# (model, style, tone, prompt_version, text_hash)
+ImprovementKey = Tuple[str, str, str, int, str]
+
+
+def make_improvement_key(model: str, style: str, tone: str, prompt_version: int, text: str) -> ImprovementKey:
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return model, style, tone, prompt_version, text_hash
+
+
+class ImprovementCache:
+    """
+    SQLite backed cache of AI improvements, so improving unchanged text again is
+    instant and free. Keys include the prompt version: changing the prompt makes old
+    entries unreachable, and they age out through the least recently used eviction
+    that keeps the table at ``max_entries`` on every write.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 2000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.closed = False  # Requests still finishing after close() neither read nor write
+        # Used from improver worker threads, access is serialized by the lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS improvements (
+                model TEXT NOT NULL,
+                style TEXT NOT NULL,
+                tone TEXT NOT NULL,
+                prompt_version INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                improved TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (model, style, tone, prompt_version, text_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_improvements_accessed ON improvements (accessed_at)")
+        self._conn.commit()
+        with self._lock:
+            self._evict_overflow()
+            self._conn.commit()
+
+    def get(self, key: ImprovementKey) -> Optional[str]:
+        with self._lock:
+            if self.closed:
+                return None
+            row = self._conn.execute(
+                "SELECT improved FROM improvements "
+                "WHERE model = ? AND style = ? AND tone = ? AND prompt_version = ? AND text_hash = ?",
+                key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE improvements SET accessed_at = ? "
+                "WHERE model = ? AND style = ? AND tone = ? AND prompt_version = ? AND text_hash = ?",
+                (time.time(), *key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: ImprovementKey, improved: str):
+        now = time.time()
+        with self._lock:
+            if self.closed:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO improvements "
+                "(model, style, tone, prompt_version, text_hash, improved, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, improved, now, now)
+            )
+            self._evict_overflow()
+            self._conn.commit()
+
+    def set_max_entries(self, max_entries: int):
+        """Change the size limit; a smaller limit evicts right away"""
+        with self._lock:
+            self.max_entries = max_entries
+            if self.closed:
+                return
+            self._evict_overflow()
+            self._conn.commit()
+
+    def _evict_overflow(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM improvements").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM improvements WHERE rowid IN "
+                "(SELECT rowid FROM improvements ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM improvements").fetchone()[0]
+            return {"size": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._conn.close()
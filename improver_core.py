@@ -0,0 +1,254 @@
+import json
+import threading
+from concurrent.futures import CancelledError
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from improvement_cache import ImprovementCache, make_improvement_key
+from language_detection import detect_language
+
+# requests is imported on first use to keep application startup fast
+if TYPE_CHECKING:
+    import requests
+
+# Settings used by the improver, shared by the tray app and the batch command
+IMPROVER_DEFAULTS = {
+    "openrouter_api_key": "",  # New setting for OpenRouter API key
+    "improver_model": "deepseek/deepseek-r1-distill-llama-70b",  # Default AI model
+    "writing_style": "Normal",  # Default writing style
+    "writing_tone": "Friendly",  # Default writing tone
+    "improver_timeout": 60,  # Seconds before an AI request is abandoned
+    "improver_cache": True,  # Reuse earlier improvements of the same text, model, style and tone
+    "improver_cache_max_entries": 2000  # Least recently used improvements are evicted beyond this
+}
+
+# Bump whenever the prompt or request parameters change so cached improvements made
+# with the old prompt are no longer returned
+PROMPT_VERSION = 1
+
+# Map language codes to full names for clearer instructions
+LANGUAGE_NAMES = {
+    'tr': 'Turkish',
+    'en': 'English',
+    'de': 'German',
+    'fr': 'French',
+    'es': 'Spanish',
+    'it': 'Italian',
+    'ru': 'Russian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'zh-cn': 'Chinese'
+}
+
+
+class RateLimitError(Exception):
+    """OpenRouter answered 429; ``retry_after`` is the server's requested wait in seconds, if any"""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__("Rate limited by the AI service")
+        self.retry_after = retry_after
+
+
+def build_system_message(style: str, tone: str, language: str) -> str:
+    """System prompt for the given writing style, tone and language name"""
+    system_message = f"You are an AI writing assistant. Please improve the given text while keeping it in {language}. "
+    system_message += f"Rewrite the text in a {style.lower()} style with a {tone.lower()} tone. "
+    system_message += "DO NOT translate the text, only improve its writing style and clarity in the same language. "
+
+    if style == "Corporate":
+        system_message += f"Use professional business language and formal expressions in {language}. "
+    elif style == "Academic":
+        system_message += f"Use scholarly language, technical terms, and formal academic writing conventions in {language}. "
+    elif style == "Friendly":
+        system_message += f"Use casual, warm, and approachable language in {language}. "
+
+    if tone == "Enthusiastic":
+        system_message += "Express excitement and positivity in the writing."
+    elif tone == "Confident":
+        system_message += "Use assertive and authoritative language."
+    elif tone == "Diplomatic":
+        system_message += "Use tactful, balanced, and considerate language."
+    return system_message
+
+
+class OpenRouterClient:
+    """Chat completion requests to OpenRouter over a reused keep-alive session"""
+    API_URL = "https://openrouter.ai/api/v1/chat/completions"
+    CONNECT_TIMEOUT = 10  # Seconds
+    TOKEN_INTERVAL = 0.05  # Seconds between reports of the streamed text, the final text is always reported
+
+    def __init__(self, api_key: str, model: str, session_factory: Optional[Callable[[], "requests.Session"]] = None,
+                 api_url: Optional[str] = None):
+        self.api_key = api_key
+        self.model = model
+        self.api_url = api_url or self.API_URL
+        self.session_factory = session_factory
+        self._session: Optional["requests.Session"] = None
+        self.last_time_to_first_token: Optional[float] = None  # Seconds, set by streamed requests
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            if self.session_factory is None:
+                from providers import create_session
+                self.session_factory = create_session
+            self._session = self.session_factory()
+        return self._session
+
+    def complete(self, system_message: str, text: str,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 timeout: Optional[float] = None) -> str:
+        """Send the chat completion request; streams the response when on_token is given"""
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": f"Please improve this text while keeping it in the same language:\n\n{text}"}
+            ],
+            "temperature": 0.7,
+            "max_tokens": 4000
+        }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:3000",
+            "X-Title": "AI Writing Assistant"
+        }
+
+        request_timeout = (self.CONNECT_TIMEOUT, timeout) if timeout else None
+
+        if on_token is not None:
+            payload["stream"] = True
+            return self._stream_completion(headers, payload, on_token, cancel_event, timeout)
+
+        response = self.session.post(url=self.api_url, headers=headers, json=payload, timeout=request_timeout)
+        self._raise_for_status(response)
+        result = response.json()
+
+        if 'choices' in result and len(result['choices']) > 0:
+            return result['choices'][0]['message']['content']
+        raise ValueError("Couldn't get a proper response from AI")
+
+    @staticmethod
+    def _raise_for_status(response: "requests.Response"):
+        if response.status_code == 429:
+            try:
+                retry_after = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                retry_after = None
+            raise RateLimitError(retry_after)
+        response.raise_for_status()
+
+    def _stream_completion(self, headers: dict, payload: dict, on_token: Callable[[str], None],
+                           cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = None) -> str:
+        """
+        Read the server-sent event stream and report the accumulated text: the first token
+        right away, then at most every TOKEN_INTERVAL, so the UI doesn't re-render a long
+        answer for every token, and the complete text at the end.
+        """
+        import requests
+
+        start = perf_counter()
+        self.last_time_to_first_token = None
+        content = ""
+        reported = ""
+        last_report = 0.0
+        request_timeout = (self.CONNECT_TIMEOUT, timeout) if timeout else None
+
+        with self.session.post(url=self.api_url, headers=headers, json=payload, stream=True,
+                               timeout=request_timeout) as response:
+            self._raise_for_status(response)
+            # Small chunks so tokens are handed over as soon as they arrive
+            for line in response.iter_lines(chunk_size=64):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise CancelledError()
+                if timeout and perf_counter() - start > timeout:
+                    raise requests.Timeout()
+                # Skip blank separators and ": OPENROUTER PROCESSING" keep-alive comments
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+
+                event = json.loads(data)
+                if "error" in event:
+                    raise ValueError(event["error"].get("message", "Streaming request failed"))
+                choices = event.get("choices") or []
+                delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                if not delta:
+                    continue
+
+                if self.last_time_to_first_token is None:
+                    self.last_time_to_first_token = perf_counter() - start
+                content += delta
+                now = perf_counter()
+                if not reported or now - last_report >= self.TOKEN_INTERVAL:
+                    on_token(content)
+                    reported, last_report = content, now
+
+        if content != reported:
+            on_token(content)
+        if not content:
+            raise ValueError("Couldn't get a proper response from AI")
+        return content
+
+
+def improve(client: OpenRouterClient, text: str, style: str = "Normal", tone: str = "Friendly",
+            on_token: Optional[Callable[[str], None]] = None,
+            cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = None) -> str:
+    """
+    Improve the text in its own language; raises ValueError if the model answered in another one.
+    No UI involved, shared by the tray app and the batch improver.
+    """
+    cancel_event = cancel_event or threading.Event()
+
+    # Detect the language of the input text
+    detected_lang = detect_language(text)
+    language = LANGUAGE_NAMES.get(detected_lang, 'the original language')
+
+    # Prepare system message based on style, tone and detected language
+    system_message = build_system_message(style, tone, language)
+    if cancel_event.is_set():
+        raise CancelledError()
+
+    improved_text = client.complete(system_message, text, on_token, cancel_event=cancel_event, timeout=timeout).strip()
+    if cancel_event.is_set():
+        raise CancelledError()
+    # Remove any quotes and cleanup the text
+    if improved_text.startswith('"') and improved_text.endswith('"'):
+        improved_text = improved_text[1:-1].strip()
+
+    # Verify that the improved text is in the same language
+    if detect_language(improved_text) != detected_lang:
+        raise ValueError("The AI generated text in a different language. Please try again.")
+    return improved_text
+
+
+def improve_cached(client: OpenRouterClient, text: str, style: str = "Normal", tone: str = "Friendly",
+                   cache: Optional[ImprovementCache] = None, force: bool = False,
+                   on_token: Optional[Callable[[str], None]] = None,
+                   cancel_event: Optional[threading.Event] = None,
+                   timeout: Optional[float] = None) -> Tuple[str, bool]:
+    """
+    improve() behind the improvement cache. ``force`` skips the lookup and replaces the
+    cached entry with a fresh completion. Returns (improved text, came from the cache).
+    """
+    key = make_improvement_key(client.model, style, tone, PROMPT_VERSION, text)
+    if cache is not None and not force:
+        try:
+            cached = cache.get(key)
+        except Exception as e:
+            print(f"Error reading improvement cache: {e}")
+            cached = None
+        if cached is not None:
+            return cached, True
+
+    improved_text = improve(client, text, style, tone, on_token, cancel_event=cancel_event, timeout=timeout)
+    if cache is not None:
+        try:
+            cache.put(key, improved_text)
+        except Exception as e:
+            print(f"Error writing improvement cache: {e}")
+    return improved_text, False
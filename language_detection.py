@@ -0,0 +1,96 @@
+import threading
+from functools import lru_cache
+from typing import Callable, Optional
+
+_langdetect: Optional[Callable[[str], str]] = None
+_langdetect_lock = threading.Lock()
+
+# (first code point, last code point, script)
+SCRIPT_RANGES = [
+    (0x0041, 0x005A, "latin"), (0x0061, 0x007A, "latin"), (0x00C0, 0x024F, "latin"),
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x04FF, "cyrillic"),
+    (0x0590, 0x05FF, "hebrew"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x1100, 0x11FF, "hangul"), (0x3130, 0x318F, "hangul"), (0xAC00, 0xD7AF, "hangul"),
+    (0x3040, 0x30FF, "kana"),
+    (0x4E00, 0x9FFF, "han"),
+]
+
+# Scripts that identify a single language without running langdetect
+SCRIPT_LANGUAGES = {
+    "greek": "el",
+    "hebrew": "he",
+    "thai": "th",
+    "hangul": "ko",
+    "kana": "ja",
+    "han": "zh-cn",
+}
+
+# Script each supported target language is written in
+LANGUAGE_SCRIPTS = {
+    "ru": "cyrillic",
+    "ja": "kana",
+    "ko": "hangul",
+    "zh-cn": "han",
+}
+
+
+def load_langdetect() -> Callable[[str], str]:
+    """Import langdetect and load its language profiles; slow, so it happens on first use"""
+    global _langdetect
+    with _langdetect_lock:
+        if _langdetect is None:
+            from langdetect import DetectorFactory, detect
+            from langdetect.detector_factory import init_factory
+
+            # langdetect is random by default; a fixed seed gives the same answer for the same text
+            DetectorFactory.seed = 0
+            init_factory()  # Reads the profiles, not thread-safe on its own
+            _langdetect = detect
+    return _langdetect
+
+
+def char_script(char: str) -> Optional[str]:
+    code = ord(char)
+    for start, end, script in SCRIPT_RANGES:
+        if start <= code <= end:
+            return script
+    return None
+
+
+def dominant_script(text: str) -> Optional[str]:
+    """Script of the majority of letters in the text, or None if there are no letters"""
+    counts = {}
+    for char in text:
+        if char.isalpha():
+            script = char_script(char)
+            if script:
+                counts[script] = counts.get(script, 0) + 1
+    if not counts:
+        return None
+    # Japanese mixes kana with kanji; any kana means Japanese rather than Chinese
+    if counts.get("kana") and "han" in counts:
+        counts["kana"] += counts.pop("han")
+    script, count = max(counts.items(), key=lambda item: item[1])
+    return script if count * 2 > sum(counts.values()) else None
+
+
+@lru_cache(maxsize=2048)
+def detect_language(text: str) -> str:
+    """Memoized language detection with a script based shortcut; lowercase langdetect codes"""
+    script = dominant_script(text)
+    if script in SCRIPT_LANGUAGES:
+        return SCRIPT_LANGUAGES[script]
+    return load_langdetect()(text)
+
+
+def is_language(text: str, lang: str) -> bool:
+    """True if the text is written in the given language"""
+    lang = lang.lower()
+    # Different scripts can't be the same language, no need to ask langdetect
+    script = dominant_script(text)
+    if script is not None and script != LANGUAGE_SCRIPTS.get(lang, "latin"):
+        return False
+    return detect_language(text) == lang
@@ -1,8 +1,9 @@
+import os
 import sys
-import json
-from typing import Optional, Dict
+import socket
+from concurrent.futures import CancelledError
+from typing import Optional
 from pathlib import Path
-from time import sleep
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel, 
                              QVBoxLayout, QSystemTrayIcon, QMenu, QColorDialog,
                              QSpinBox, QCheckBox, QComboBox, QFontComboBox,
@@ -10,11 +11,16 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QLabel,
                              QHBoxLayout, QGridLayout, QTabWidget, QGroupBox, QFormLayout)
 from PySide6.QtCore import Qt, QTimer, QPoint, QKeyCombination, QEvent, Signal
 from PySide6.QtGui import QFont, QAction, QIcon, QColor, QCursor, QKeySequence
-from deep_translator import GoogleTranslator
-import deepl
-from langdetect import detect
 import keyboard
 from academic_editor import AcademicImprover, WindowManager  # WindowManager eklendi
+from translation_worker import TranslationExecutor
+from clipboard_capture import ClipboardCapture
+from settings_store import SettingsStore
+from language_detection import load_langdetect
+from warmup import WarmupThread
+from overlay_render import OverlayRenderCache
+from translation_core import TRANSLATION_DEFAULTS, TranslationCore
+from improver_core import IMPROVER_DEFAULTS
 
 COMMON_STYLES = """
     QWidget {
@@ -120,96 +126,210 @@ COMMON_STYLES = """
 """
 
 class TranslationWidget(QMainWindow):
-    CACHE_LIMIT = 500  # Sabit cache limiti
+    improve_requested = Signal()  # Emitted from the keyboard hook thread
+    translate_requested = Signal()  # Emitted from the keyboard hook thread
     
     def __init__(self):
         super().__init__()
         self.settings_file = Path("settings.json")
-        self.translator_cache: Dict[str, str] = {}
+        self.cache_file = Path("translation_cache.db")
         self.last_copied = ''
+        self.progress_shown = False
         self.load_settings()
+        # Caches, provider clients and fallback logic; runs on worker threads, knows nothing about Qt
+        self.core = TranslationCore(self.settings, self.cache_file)
+        self.providers = self.core.providers  # Reused translation clients and HTTP connections
+        self.render_cache = OverlayRenderCache()
+        self.applied_styles = {}  # Widget name -> stylesheet last applied to it
         self.setup_ui()
         self.setup_tray()
         self.hide()
 
+        # Translations run on a worker pool so network calls never block the GUI thread
+        self.translation_executor = TranslationExecutor(parent=self)
+        self.translation_executor.result_ready.connect(self.on_translation_ready)
+        self.translation_executor.progress.connect(self.on_translation_progress)
+        self.translation_executor.error.connect(self.show_error)
+        QApplication.instance().aboutToQuit.connect(self.translation_executor.cancel_all)
+        QApplication.instance().aboutToQuit.connect(self.core.close)
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide)
+
         # Initialize window manager and academic improver
-        self.window_manager = WindowManager()
-        self.academic_improver = AcademicImprover(self)
+        self.window_manager = WindowManager(self.settings["max_popup_windows"])
+        self.academic_improver = AcademicImprover(self, session_factory=lambda: self.providers.session,
+                                                  cache_file=Path("improvement_cache.db"))
         self.academic_improver.set_window_manager(self.window_manager)
+        QApplication.instance().aboutToQuit.connect(self.academic_improver.close)
 
         self.clipboard = QApplication.clipboard()
         self.clipboard.dataChanged.connect(self.on_clipboard_change)
         
-        self.is_improving = False  # Academic improvement işlemini takip etmek için flag
+        # Clipboard bursts are coalesced; only the last stable value gets translated
+        self.pending_clipboard_text = None
+        self.avoided_translations = 0
+        self.clipboard_debounce = QTimer(self)
+        self.clipboard_debounce.setSingleShot(True)
+        self.clipboard_debounce.timeout.connect(self.flush_clipboard_change)
+
+        # Hotkeys copy the selection through this; clipboard changes are ignored while it waits
+        self.clipboard_capture = ClipboardCapture(self.clipboard, self.settings["clipboard_timeout_ms"], self)
+
+        # The hook only emits a signal; the actual work starts on the GUI thread
+        self.improve_requested.connect(self.improve_selected_text, Qt.QueuedConnection)
+        self.translate_requested.connect(self.translate_selected_text, Qt.QueuedConnection)
+
+        # Each subsystem reconfigures only when a setting it depends on changes
+        self.connect_settings()
 
         # Update translation shortcut based on settings
+        self.hotkeys = {}  # Hotkey name -> keyboard hook handle
         self.update_shortcut()
 
+        # Tray is up; load the rest in the background so the first hotkey press is fast
+        self.start_warmup()
+
+    def start_warmup(self):
+        self.warmup = None
+        if not self.settings["prewarm"]:
+            return
+
+        tasks = [("langdetect", load_langdetect), ("google", self.warm_google)]
+        if self.settings["use_deepl"] and self.settings["deepl_api_key"]:
+            tasks.append(("deepl", self.warm_deepl))
+        if self.settings.get("use_improver", True) and self.settings.get("openrouter_api_key"):
+            tasks.append(("openrouter", self.warm_openrouter))
+
+        self.warmup = WarmupThread(tasks, self)
+        self.warmup.task_finished.connect(self.on_warmup_task_finished)
+        QApplication.instance().aboutToQuit.connect(self.stop_warmup)
+        self.warmup.start_low_priority()
+
+    def stop_warmup(self):
+        if self.warmup and self.warmup.isRunning():
+            self.warmup.cancel()
+            self.warmup.wait(1000)
+
+    def warm_google(self):
+        self.providers.google(self.settings["target_lang"])  # Imports the SDK
+        socket.getaddrinfo("translate.google.com", 443)  # deep_translator has no session, warm DNS only
+
+    def warm_deepl(self):
+        # A cheap authenticated call opens the keep-alive TLS connection of the reused client
+        self.providers.deepl(self.settings["deepl_api_key"]).get_usage()
+
+    def warm_openrouter(self):
+        self.academic_improver.session.head(self.academic_improver.API_URL, timeout=5)
+
+    def on_warmup_task_finished(self, name: str, seconds: float, error: str):
+        if error:
+            print(f"Warm-up {name} failed after {seconds * 1000:.0f} ms: {error}")
+        else:
+            print(f"Warm-up {name}: {seconds * 1000:.0f} ms")
+
+    def connect_settings(self):
+        self.settings.subscribe_key(("font_family", "font_size", "text_color"), lambda *_: self.update_label_style())
+        self.settings.subscribe_key(("frame_color", "frame_alpha"), lambda *_: self.update_widget_style())
+        self.settings.subscribe_key("keyboard_shortcut", lambda *_: self.update_translate_hotkey())
+        self.settings.subscribe_key(("improve_shortcut", "use_improver"), lambda *_: self.update_improve_hotkey())
+        self.settings.subscribe_key("deepl_api_key", lambda *_: self.providers.invalidate("deepl"))
+        self.settings.subscribe_key("target_lang", lambda *_: self.providers.invalidate("google"))
+        self.settings.subscribe_key("hedge_percentile", lambda _, value: setattr(self.core.hedger, "percentile", value))
+        self.settings.subscribe_key("breaker_failures",
+                                    lambda _, value: self.core.health.configure(failure_threshold=value))
+        self.settings.subscribe_key("breaker_backoff", lambda _, value: self.core.health.configure(base_delay=value))
+        self.settings.subscribe_key("improver_cache_max_entries",
+                                    lambda _, value: self.academic_improver.set_cache_max_entries(value))
+        self.settings.subscribe_key("clipboard_timeout_ms",
+                                    lambda _, value: setattr(self.clipboard_capture, "timeout_ms", value))
+
     def update_shortcut(self):
-        # Remove any existing keyboard hooks
-        keyboard.unhook_all()
-        
-        # Set up translation shortcut
-        shortcut = self.settings.get("keyboard_shortcut", "a")  # Default to 'a' if not set
-        keyboard.on_press_key(shortcut, self.simulate_copy)
-        
+        self.update_translate_hotkey()
+        self.update_improve_hotkey()
+
+    def update_translate_hotkey(self):
+        self.set_hotkey("translate", self.settings["keyboard_shortcut"], self.simulate_copy)
+
+    def update_improve_hotkey(self):
         # Set up improver shortcut if enabled
-        if self.settings.get("use_improver", True):
-            improve_shortcut = self.settings.get("improve_shortcut", "f2")
-            keyboard.on_press_key(improve_shortcut, lambda _: self.improve_selected_text())
+        if self.settings["use_improver"]:
+            self.set_hotkey("improve", self.settings["improve_shortcut"], lambda _: self.improve_requested.emit())
+        else:
+            self.set_hotkey("improve", None, None)
+
+    def set_hotkey(self, name: str, key: Optional[str], callback):
+        """Swap a single hotkey without touching the other global hooks"""
+        handle = self.hotkeys.pop(name, None)
+        if handle is not None:
+            keyboard.unhook_key(handle)
+        if key:
+            self.hotkeys[name] = keyboard.on_press_key(key, callback)
             
     def simulate_copy(self, event):
-        # Don't trigger copy if we're in improving mode
-        if not self.is_improving:
-            # Simulate Ctrl+C using keyboard module instead of QTest
-            keyboard.send('ctrl+c')
-        
-    def on_clipboard_change(self):
-        # Eğer academic improvement işlemi yapılıyorsa çeviriyi atla
-        if self.is_improving:
-            return
-            
-        text = self.clipboard.text()
+        # Don't trigger copy while another hotkey is still copying
+        if not self.clipboard_capture.active:
+            self.translate_requested.emit()
+
+    def translate_selected_text(self):
+        self.clipboard_capture.capture(self.translate_copied_text)
+
+    def translate_copied_text(self, text: Optional[str]):
+        # None: the hotkey copied nothing (no selection), don't translate the old clipboard
         if text and text != self.last_copied:
             self.last_copied = text
             self.do_translate(text)
+        elif text:
+            self.avoided_translations += 1
+        
+    def on_clipboard_change(self):
+        # Hotkey kopyalaması sürüyorsa metni o işleyecek
+        if self.clipboard_capture.active:
+            return
+
+        delay = self.settings["clipboard_debounce_ms"]
+        if delay <= 0:
+            self.translate_copied_text(self.clipboard.text())
+            return
+
+        # A newer value replaces one that was still waiting to be translated
+        if self.pending_clipboard_text is not None:
+            self.avoided_translations += 1
+        self.pending_clipboard_text = self.clipboard.text()
+        self.clipboard_debounce.start(delay)
+
+    def flush_clipboard_change(self):
+        text, self.pending_clipboard_text = self.pending_clipboard_text, None
+        if text is not None:
+            self.translate_copied_text(text)
 
     def load_settings(self):
         default_settings = {
-            "show_translation_details": True,
+            **TRANSLATION_DEFAULTS,
+            **IMPROVER_DEFAULTS,
             "text_color": "#000000",
             "font_family": "Arial",
             "font_size": 12,
             "display_time": 5000,
-            "target_lang": "tr",
             "window_alpha": 0.9,
             "frame_color": "#F0F0F0",
             "frame_alpha": 0.9,
             "keyboard_shortcut": "a",  # Default shortcut
-            "use_deepl": False,
-            "deepl_api_key": "",  # New setting for DeepL API key
-            "openrouter_api_key": "",  # New setting for OpenRouter API key
             "improve_shortcut": "f2",  # Default shortcut for Academic Improver
             "use_improver": True,  # Academic improver aktif/pasif ayarı
-            "improver_model": "deepseek/deepseek-r1-distill-llama-70b",  # Default AI model
-            "writing_style": "Normal",  # Default writing style
-            "writing_tone": "Friendly"  # Default writing tone
+            "stream_improver": True,  # Show AI output while it is being generated
+            "clipboard_timeout_ms": 500,  # Longest wait for the copied text to reach the clipboard
+            "clipboard_debounce_ms": 150,  # Pano değişiklikleri bu süre sabit kalınca çevrilir (0 = kapalı)
+            "prewarm": True,  # Açılıştan sonra dil tespiti ve bağlantıları arka planda hazırla
+            "max_popup_windows": 5  # Aynı anda açık kalabilecek sonuç/hata pencereleri
         }
 
-        try:
-            if self.settings_file.exists():
-                self.settings = {**default_settings, **json.loads(self.settings_file.read_text('utf-8'))}
-            else:
-                self.settings = default_settings
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-            self.settings = default_settings
+        # Writes are batched and done atomically on a background thread
+        self.settings = SettingsStore(self.settings_file, default_settings)
+        QApplication.instance().aboutToQuit.connect(self.settings.flush)
 
     def save_settings(self):
-        try:
-            self.settings_file.write_text(json.dumps(self.settings, indent=4, ensure_ascii=False), 'utf-8')
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        self.settings.save()
     
     def setup_ui(self):
         # Pencereyi tamamen frameless ve şeffaf yap
@@ -236,30 +356,23 @@ class TranslationWidget(QMainWindow):
         self.update_widget_style()
 
     def update_label_style(self):
-        font = QFont(
-            self.settings["font_family"],
-            self.settings["font_size"]
-        )
-        self.translation_label.setFont(font)
-        self.translation_label.setStyleSheet(
-            f"color: {self.settings['text_color']};"
-            f"padding: 10px;"
-        )
+        font = self.render_cache.font(self.settings["font_family"], self.settings["font_size"])[0]
+        if self.translation_label.font() != font:
+            self.translation_label.setFont(font)
+        self.apply_style("label", self.translation_label,
+                         self.render_cache.label_style(self.settings["text_color"]))
 
     def update_widget_style(self):
-        frame_color = QColor(self.settings["frame_color"])
-        frame_color.setAlphaF(self.settings["frame_alpha"])
-        
-        # Ana pencereye stil uygula
-        style = f"""
-            QWidget#centralWidget {{
-                background-color: {frame_color.name(QColor.HexArgb)};
-                border-radius: 10px;
-                border: none;
-            }}
-        """
         self.central_widget.setObjectName("centralWidget")  # Stil için ID ekle
-        self.setStyleSheet(style)
+        # Ana pencereye stil uygula
+        self.apply_style("window", self, self.render_cache.frame_style(
+            self.settings["frame_color"], self.settings["frame_alpha"]))
+
+    def apply_style(self, name: str, widget: QWidget, style: str):
+        """setStyleSheet re-parses and re-polishes the widget tree, skip it when nothing changed"""
+        if self.applied_styles.get(name) != style:
+            widget.setStyleSheet(style)
+            self.applied_styles[name] = style
         
     def setup_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
@@ -277,6 +390,10 @@ class TranslationWidget(QMainWindow):
         ai_assistant_action = QAction("AI Writing Assistant", self)  # Removed (F2) from menu text
         ai_assistant_action.triggered.connect(self.show_ai_assistant)
         
+        # Provider health, refreshed every time the menu opens
+        self.status_menu = QMenu("Provider Status", tray_menu)
+        self.status_menu.aboutToShow.connect(self.update_status_menu)
+
         quit_action = QAction("Exit", self)
         quit_action.triggered.connect(QApplication.quit)
 
@@ -284,12 +401,18 @@ class TranslationWidget(QMainWindow):
         tray_menu.addAction(settings_action)
         tray_menu.addSeparator()
         tray_menu.addAction(ai_assistant_action)
+        tray_menu.addMenu(self.status_menu)
         tray_menu.addSeparator()
         tray_menu.addAction(quit_action)
 
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
 
+    def update_status_menu(self):
+        self.status_menu.clear()
+        for line in self.core.health.describe() or ["No requests yet"]:
+            self.status_menu.addAction(line).setEnabled(False)
+
     def set_writing_style(self, style):
         # Uncheck all other styles
         for s, action in self.style_actions.items():
@@ -305,103 +428,48 @@ class TranslationWidget(QMainWindow):
         self.save_settings()
 
     def do_translate(self, text: str):
-        try:
-            if self.settings["show_translation_details"]:
-                words = text.split()
-                translations = []
-                chunk_size = 5
-                
-                for i in range(0, len(words), chunk_size):
-                    chunk = ' '.join(words[i:min(i + chunk_size, len(words))])
-                    translation = self.translate_text(chunk)
-                    if translation:
-                        translations.append(f"{chunk} → {translation}")
-                
-                result = "\n".join(translations)
-            else:
-                result = self.translate_text(text)
-
-            if result:
-                self.show_translation(result)
-
-        except Exception as e:
-            self.show_error(str(e))
-
-    def translate_text(self, text: str) -> Optional[str]:
-        if text in self.translator_cache:
-            return self.translator_cache[text]
-
-        try:
-            # Only detect language if needed
-            detected_lang = detect(text)
-            if detected_lang == self.settings["target_lang"]:
-                return text
-
-            if self.settings["use_deepl"] and self.settings["deepl_api_key"]:
-                try:
-                    translator = deepl.Translator(self.settings["deepl_api_key"])
-                    result = translator.translate_text(text, target_lang=self.settings["target_lang"].upper())
-                    translation = result.text
-                except Exception as e:
-                    print(f"DeepL translation error: {e}")
-                    # Fallback to Google Translate if DeepL fails
-                    translator = GoogleTranslator(
-                        source='auto',
-                        target=self.settings["target_lang"]
-                    )
-                    translation = translator.translate(text)
-            else:
-                translator = GoogleTranslator(
-                    source='auto',
-                    target=self.settings["target_lang"]
-                )
-                translation = translator.translate(text)
-            
-            # Cache management
-            if len(self.translator_cache) >= self.CACHE_LIMIT:
-                # Remove oldest entries to make space
-                remove_count = len(self.translator_cache) - self.CACHE_LIMIT + 1
-                for _ in range(remove_count):
-                    self.translator_cache.pop(next(iter(self.translator_cache)))
-            
-            self.translator_cache[text] = translation
-            return translation
-        except Exception as e:
-            print(f"Translation error: {e}")
-            return None
+        """Schedule translation of the text, superseding any job still in progress"""
+        self.progress_shown = False
+        self.translation_executor.submit(self.core.build_translation, text)
 
-    def show_translation(self, text: str):
+    def on_translation_progress(self, partial: str):
+        if partial:
+            # Keep the popup where it first appeared while more lines arrive
+            self.show_translation(partial, reposition=not self.progress_shown)
+            self.progress_shown = True
+
+    def on_translation_ready(self, result: Optional[str]):
+        if result:
+            self.show_translation(result, reposition=not self.progress_shown)
+
+    def show_translation(self, text: str, reposition: bool = True):
         self.translation_label.setText(text)
         self.adjust_size()
-        self.move_to_cursor()
+        if reposition:
+            self.move_to_cursor()
         self.show()
-        QTimer.singleShot(self.settings["display_time"], self.hide)
+        self.hide_timer.start(self.settings["display_time"])
 
     def show_error(self, error_msg: str):
         self.translation_label.setText(f"Hata: {error_msg}")
         self.adjust_size()
         self.move_to_cursor()
         self.show()
-        QTimer.singleShot(5000, self.hide)
+        self.hide_timer.start(5000)
 
     def adjust_size(self):
-        text = self.translation_label.text()
-        font_metrics = self.translation_label.fontMetrics()
-        
-        # Optimize size calculations
         padding = 20
-        text_width = min(
-            800,  # Maximum width
-            max(200, font_metrics.horizontalAdvance(text.split('\n')[0]) + padding * 2)
-        )
-        
-        self.translation_label.setFixedWidth(text_width)
-        self.translation_label.adjustSize()
-        
-        window_width = text_width + padding * 2
-        window_height = self.translation_label.height() + padding * 2
-        
-        self.resize(int(window_width), int(window_height))
+        text_width, text_height = self.render_cache.measure(
+            self.translation_label.text(), self.settings["font_family"], self.settings["font_size"], padding)
+
+        if self.translation_label.maximumWidth() != text_width:
+            self.translation_label.setFixedWidth(text_width)
+        self.translation_label.resize(text_width, text_height)
+        # Apply the new size constraints now, otherwise the previous (wider) popup's minimum sticks
+        self.central_widget.layout().activate()
+        self.layout().activate()
+
+        self.resize(text_width + padding * 2, text_height + padding * 2)
 
     def move_to_cursor(self):
         cursor_pos = QCursor.pos()
@@ -427,41 +495,29 @@ class TranslationWidget(QMainWindow):
         self.settings_window.show()
 
     def improve_selected_text(self):
-        """Opens the AI Writing Assistant window and processes selected text"""
+        """Copies the selected text and sends it to the AI Writing Assistant"""
         if not self.settings.get("use_improver", True):  # If improver is disabled
             self.window_manager.show_error.emit("AI Writing Assistant is disabled. Enable it in settings.")
             return
 
-        # Disconnect clipboard signal temporarily
-        self.clipboard.dataChanged.disconnect(self.on_clipboard_change)
-        
-        # Set improving flag before getting text
-        self.is_improving = True
-        try:
-            # Get selected text directly without using clipboard
-            keyboard.send('ctrl+c')
-            sleep(0.2)  # Wait for clipboard to update
-            text = self.clipboard.text().strip()
-            
-            if not text:
-                self.window_manager.show_error.emit("Please select some text first!")
-                return
-                
-            # Always use Academic style when using F2 shortcut
-            self.settings["writing_style"] = "Academic"
-            self.settings["writing_tone"] = "Confident"  # Academic yazılar için uygun ton
-            self.save_settings()
-            
-            # Improve text using academic improver
-            self.academic_improver.improve_text(
-                text,
-                style="Academic",
-                tone="Confident"
-            )
-        finally:
-            # Reset improving flag and reconnect clipboard
-            self.is_improving = False
-            self.clipboard.dataChanged.connect(self.on_clipboard_change)
+        # Returns immediately; the text arrives as soon as the clipboard changes.
+        # If it doesn't change, the selection may already be on the clipboard: improve that.
+        self.clipboard_capture.capture(self.improve_copied_text, read_on_timeout=True)
+
+    def improve_copied_text(self, text: str):
+        text = text.strip()
+        if not text:
+            self.window_manager.show_error.emit("Please select some text first!")
+            return
+
+        # Always use Academic style when using F2 shortcut, without overwriting the saved preferences.
+        # Improve text in the background; results arrive through the window manager
+        self.academic_improver.submit(
+            text,
+            style="Academic",
+            tone="Confident",
+            owner="hotkey"
+        )
 
     def show_ai_assistant(self):
         """Shows the AI Writing Assistant window"""
@@ -472,6 +528,8 @@ class TranslationWidget(QMainWindow):
 
 class AIWritingAssistantWindow(QWidget):
     text_ready = Signal(str)  # Signal for handling improved text
+    partial_text_ready = Signal(str)  # Streamed text received so far
+    job_done = Signal(object)  # Future of a finished improvement job
     
     def __init__(self, parent):
         super().__init__()
@@ -486,6 +544,9 @@ class AIWritingAssistantWindow(QWidget):
         
         # Connect text_ready signal
         self.text_ready.connect(self.update_output_text, Qt.QueuedConnection)
+        self.partial_text_ready.connect(self.update_output_text, Qt.QueuedConnection)
+        self.job_done.connect(self.on_job_done, Qt.QueuedConnection)
+        self.current_job = None  # Future of the running transformation
 
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -568,12 +629,21 @@ class AIWritingAssistantWindow(QWidget):
         self.output_text.setReadOnly(True)
         text_layout.addWidget(output_label)
         text_layout.addWidget(self.output_text)
+
+        # Streaming statistics (time to first token)
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #7f8c8d; font-weight: normal;")
+        text_layout.addWidget(self.status_label)
         
         main_layout.addWidget(text_group)
         
         # Transform button
         button_layout = QHBoxLayout()
         button_layout.addStretch()
+        # Unchanged input comes from the improvement cache unless a fresh version is requested
+        self.force_regenerate = QCheckBox("Force regenerate")
+        self.force_regenerate.setToolTip("Ask the AI again even if this text was already improved with these options")
+        button_layout.addWidget(self.force_regenerate)
         self.transform_button = QPushButton("Transform Text")
         self.transform_button.setMinimumWidth(150)
         self.transform_button.clicked.connect(self.transform_text)
@@ -585,38 +655,60 @@ class AIWritingAssistantWindow(QWidget):
         self.setStyleSheet(COMMON_STYLES)
 
     def transform_text(self):
+        # While a transformation is running the button cancels it
+        if self.current_job is not None:
+            self.parent.academic_improver.cancel("assistant")
+            self.current_job = None  # Its late completion is ignored
+            self.transform_button.setText("Transform Text")
+            self.output_text.setPlainText("Transformation cancelled.")
+            return
+
         text = self.text_input.toPlainText().strip()
         if not text:
             self.parent.window_manager.show_error.emit("Please enter some text first!")
             return
             
-        try:
-            style = self.style_combo.currentText()
-            tone = self.tone_combo.currentText()
-            model_name = self.model_combo.currentText()
-            
-            # Save selected options
-            self.parent.settings["writing_style"] = style
-            self.parent.settings["writing_tone"] = tone
-            self.parent.settings["improver_model"] = SettingsWindow.AI_MODELS[model_name]
-            self.parent.save_settings()
-            
-            # Display "Processing..." message
-            self.output_text.setPlainText("Processing...")
-            QApplication.processEvents()  # Update UI
-            
-            # Pass style and tone to academic improver
-            self.parent.academic_improver.improve_text(
-                text,
-                style=style,
-                tone=tone,
-                callback=self.handle_improved_text
-            )
-            
-        except Exception as e:
-            error_msg = str(e)
-            self.parent.window_manager.show_error.emit(error_msg)
+        style = self.style_combo.currentText()
+        tone = self.tone_combo.currentText()
+        model_name = self.model_combo.currentText()
+        
+        # Save selected options
+        self.parent.settings["writing_style"] = style
+        self.parent.settings["writing_tone"] = tone
+        self.parent.settings["improver_model"] = SettingsWindow.AI_MODELS[model_name]
+        self.parent.save_settings()
+        
+        # Display "Processing..." message
+        self.output_text.setPlainText("Processing...")
+        self.status_label.setText("")
+        self.transform_button.setText("Cancel")
+        
+        # Pass style and tone to academic improver
+        job = self.parent.academic_improver.submit(
+            text,
+            style=style,
+            tone=tone,
+            owner="assistant",
+            callback=self.handle_improved_text,
+            on_token=self.partial_text_ready.emit,
+            force=self.force_regenerate.isChecked()
+        )
+        self.current_job = job
+        job.add_done_callback(self.job_done.emit)
+
+    def on_job_done(self, job):
+        """Runs in the main thread once an improvement job has finished"""
+        if job is not self.current_job:
+            return  # Superseded job
+        self.current_job = None
+        self.transform_button.setText("Transform Text")
+
+        if job.cancelled() or isinstance(job.exception(), CancelledError):
+            self.output_text.setPlainText("Transformation cancelled.")
+        elif job.exception() is not None:
             self.output_text.setPlainText("Error occurred during transformation.")
+        else:
+            self.status_label.setText(job.result().status)
 
     def handle_improved_text(self, improved_text):
         """Callback function to handle the improved text from the AI"""
@@ -914,12 +1006,10 @@ class SettingsWindow(QWidget):
 
     def update_font(self):
         self.parent.settings["font_family"] = self.font_combo.currentFont().family()
-        self.parent.update_label_style()
         self.parent.save_settings()
 
     def update_font_size(self):
         self.parent.settings["font_size"] = self.size_spin.value()
-        self.parent.update_label_style()
         self.parent.save_settings()
 
     def choose_text_color(self):
@@ -930,7 +1020,6 @@ class SettingsWindow(QWidget):
         )
         if color.isValid():
             self.parent.settings["text_color"] = color.name()
-            self.parent.update_label_style()
             self.parent.save_settings()
 
     def choose_frame_color(self):
@@ -941,12 +1030,10 @@ class SettingsWindow(QWidget):
         )
         if color.isValid():
             self.parent.settings["frame_color"] = color.name()
-            self.parent.update_widget_style()
             self.parent.save_settings()
 
     def update_frame_alpha(self):
         self.parent.settings["frame_alpha"] = self.frame_alpha_spin.value() / 100
-        self.parent.update_widget_style()
         self.parent.save_settings()
 
     def update_display_time(self):
@@ -954,8 +1041,7 @@ class SettingsWindow(QWidget):
         self.parent.save_settings()
 
     def update_shortcut(self, shortcut):
-        self.parent.settings["keyboard_shortcut"] = shortcut.lower()
-        self.parent.update_shortcut()  # Update the active shortcut
+        self.parent.settings["keyboard_shortcut"] = shortcut.lower()  # Swaps the translate hook
         self.parent.save_settings()
 
     def update_use_deepl(self):
@@ -971,11 +1057,8 @@ class SettingsWindow(QWidget):
         self.parent.save_settings()
         
     def update_improve_shortcut(self, shortcut):
-        old_shortcut = self.parent.settings.get("improve_shortcut", "f2")
-        new_shortcut = shortcut.lower()
-        self.parent.settings["improve_shortcut"] = new_shortcut
+        self.parent.settings["improve_shortcut"] = shortcut.lower()  # Swaps the improve hook
         self.parent.save_settings()
-        self.parent.update_shortcut()  # Update keyboard shortcuts
 
     def update_use_improver(self):
         self.parent.settings["use_improver"] = self.use_improver.isChecked()
@@ -989,4 +1072,7 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # System tray için gerekli
     translator = TranslationWidget()
+    if os.environ.get("SCREEN_TRANSLATOR_STARTUP_PROBE"):
+        # benchmarks/startup_time.py: report once the event loop runs with the tray visible
+        QTimer.singleShot(0, lambda: (print("tray-ready", flush=True), app.quit()))
     sys.exit(app.exec())
\ No newline at end of file
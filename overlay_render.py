@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import Dict, Tuple
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+
+
+class OverlayRenderCache:
+    """
+    Keeps everything the overlay needs to draw a translation that depends only on settings:
+    QFont/QFontMetrics per (family, size), stylesheet strings per colour, and the laid out
+    size of each (text, font) pair, so showing a result doesn't re-parse stylesheets or
+    re-measure text that has been shown before.
+    """
+    LABEL_PADDING = 10  # padding in the label stylesheet
+    MIN_WIDTH = 200
+    MAX_WIDTH = 800
+
+    def __init__(self, max_layouts: int = 256):
+        self.max_layouts = max_layouts
+        self._fonts: Dict[Tuple[str, int], Tuple[QFont, QFontMetrics]] = {}
+        self._styles: Dict[tuple, str] = {}
+        self._layouts: "OrderedDict[tuple, Tuple[int, int]]" = OrderedDict()
+        self.layout_hits = 0
+        self.layout_misses = 0
+
+    def font(self, family: str, size: int) -> Tuple[QFont, QFontMetrics]:
+        key = (family, size)
+        if key not in self._fonts:
+            font = QFont(family, size)
+            self._fonts[key] = (font, QFontMetrics(font))
+        return self._fonts[key]
+
+    def label_style(self, text_color: str) -> str:
+        key = ("label", text_color)
+        if key not in self._styles:
+            self._styles[key] = f"color: {text_color};padding: {self.LABEL_PADDING}px;"
+        return self._styles[key]
+
+    def frame_style(self, frame_color: str, frame_alpha: float) -> str:
+        key = ("frame", frame_color, frame_alpha)
+        if key not in self._styles:
+            color = QColor(frame_color)
+            color.setAlphaF(frame_alpha)
+            self._styles[key] = f"""
+            QWidget#centralWidget {{
+                background-color: {color.name(QColor.HexArgb)};
+                border-radius: 10px;
+                border: none;
+            }}
+        """
+        return self._styles[key]
+
+    def measure(self, text: str, family: str, size: int, padding: int = 20) -> Tuple[int, int]:
+        """(label width, label height) for the text; the width follows the first line"""
+        key = (text, family, size, padding)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            self.layout_hits += 1
+            return layout
+
+        self.layout_misses += 1
+        metrics = self.font(family, size)[1]
+        width = min(self.MAX_WIDTH,
+                    max(self.MIN_WIDTH, metrics.horizontalAdvance(text.split('\n')[0]) + padding * 2))
+        text_width = width - self.LABEL_PADDING * 2
+        text_height = metrics.boundingRect(QRect(0, 0, text_width, 1 << 20),
+                                           Qt.TextWordWrap | Qt.AlignLeft, text).height()
+        layout = (int(width), text_height + self.LABEL_PADDING * 2)
+
+        self._layouts[key] = layout
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return layout
@@ -0,0 +1,81 @@
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+# Provider SDKs are imported on first use to keep application startup fast
+if TYPE_CHECKING:
+    import deepl
+    import requests
+    from deep_translator import GoogleTranslator
+
+
+def create_session(pool_size: int = 8) -> "requests.Session":
+    """requests.Session with a connection pool large enough for parallel chunk requests"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ProviderRegistry:
+    """
+    Builds translation clients once and reuses them (and their keep-alive connections)
+    across calls. A client is rebuilt only when its API key or target language changes.
+    """
+
+    def __init__(self, deepl_server_url: Optional[str] = None):
+        self.deepl_server_url = deepl_server_url
+        self._session: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+        self._deepl: Optional[Tuple[str, "deepl.Translator"]] = None
+        # GoogleTranslator keeps request parameters on the instance, so each thread gets its own
+        self._local = threading.local()
+
+    @property
+    def session(self) -> "requests.Session":
+        """Shared by plain HTTP clients such as OpenRouter, created on first use"""
+        with self._lock:
+            if self._session is None:
+                self._session = create_session()
+            return self._session
+
+    def deepl(self, api_key: str) -> "deepl.Translator":
+        with self._lock:
+            if self._deepl is None or self._deepl[0] != api_key:
+                import deepl
+
+                # The old client isn't closed: chunk and hedge threads may still be in a
+                # request on it. Its connections are released when it is garbage collected.
+                self._deepl = (api_key, deepl.Translator(api_key, server_url=self.deepl_server_url))
+            return self._deepl[1]
+
+    def google(self, target_lang: str) -> "GoogleTranslator":
+        clients: Dict[str, "GoogleTranslator"] = getattr(self._local, "google", None)
+        if clients is None:
+            clients = self._local.google = {}
+        if target_lang not in clients:
+            from deep_translator import GoogleTranslator
+
+            clients.clear()  # Target changed, drop the old client
+            clients[target_lang] = GoogleTranslator(source='auto', target=target_lang)
+        return clients[target_lang]
+
+    def invalidate(self, provider: Optional[str] = None):
+        """Drop cached clients so the next call builds fresh ones; requests in flight finish on the old ones"""
+        with self._lock:
+            if provider in (None, "deepl"):
+                self._deepl = None
+        if provider in (None, "google"):
+            self._local = threading.local()
+
+    def close(self):
+        """Release all connections, on shutdown"""
+        with self._lock:
+            if self._deepl is not None:
+                self._deepl[1].close()
+        self.invalidate()
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,186 @@
+"""
+Command line entry points that run the app's pipelines without the tray app.
+
+    python -m screen_translator translate glossary.txt notes.txt -o out.jsonl
+    cat words.txt | python -m screen_translator translate --target de --concurrency 8
+    python -m screen_translator improve drafts/ --style Academic --tone Confident
+
+translate: every non-empty input line is translated with the same caches, providers,
+hedging and fallbacks as the hotkey, using the app's settings.json. One JSON object
+per line is written in input order: {"source", "line", "text", "translation", "error"}.
+
+improve: the paragraphs of each file (or of every .txt/.md file in a directory) are
+run through the AI improver; results go to <name>.improved<suffix> next to the input.
+An interrupted run resumes from its checkpoint.
+"""
+import argparse
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, TextIO, Tuple
+
+from batch_improver import BatchImprover, find_inputs
+from improvement_cache import ImprovementCache
+from improver_core import IMPROVER_DEFAULTS, OpenRouterClient
+from settings_store import SettingsStore
+from translation_core import TRANSLATION_DEFAULTS, TranslationCore
+
+
+# (source, line number, text, error)
+InputLine = Tuple[str, int, Optional[str], Optional[str]]
+
+
+def read_lines(paths: List[str]) -> Iterator[InputLine]:
+    """
+    (source, line number, text, None) for every non-empty line, read lazily. A file that
+    can't be opened or decoded yields (source, line number, None, error) and reading
+    goes on with the next file.
+    """
+    for path in paths or ["-"]:
+        source = "<stdin>" if path == "-" else path
+        number = 0
+        try:
+            stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+            try:
+                for number, line in enumerate(stream, 1):
+                    text = line.strip()
+                    if text:
+                        yield source, number, text, None
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Skipping {source}: {e}", file=sys.stderr)
+            yield source, number + 1, None, str(e)
+
+
+def translate_lines(core: TranslationCore, lines: Iterator[InputLine],
+                    output: TextIO, concurrency: int) -> Tuple[int, int]:
+    """Translate on a thread pool; at most a few batches are kept in memory. Returns (lines, errors)"""
+    pending: Deque[Tuple[str, int, Optional[str], Future]] = deque()
+    written = errors = 0
+
+    def write_oldest():
+        nonlocal written, errors
+        source, number, text, future = pending.popleft()
+        record = {"source": source, "line": number, "text": text, "translation": None, "error": None}
+        try:
+            record["translation"] = future.result()
+            if record["translation"] is None:
+                record["error"] = "Translation failed"
+        except Exception as e:
+            record["error"] = str(e)
+        errors += record["error"] is not None
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        written += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for source, number, text, error in lines:
+            if error is None:
+                future = pool.submit(core.translate, text)
+            else:
+                # Written in order like any failed line
+                future = Future()
+                future.set_exception(OSError(error))
+            pending.append((source, number, text, future))
+            if len(pending) >= concurrency * 4:
+                write_oldest()
+        while pending:
+            write_oldest()
+    output.flush()
+    return written, errors
+
+
+def translate_command(args: argparse.Namespace) -> int:
+    settings = SettingsStore(Path(args.settings), TRANSLATION_DEFAULTS)  # Read only, never saved
+    if args.target:
+        settings["target_lang"] = args.target
+    if args.deepl_key is not None:
+        settings["deepl_api_key"] = args.deepl_key
+        settings["use_deepl"] = bool(args.deepl_key)
+    settings["show_translation_details"] = False
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    # The pipeline reports provider errors with print(); keep them out of the JSONL
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    concurrency = max(1, args.concurrency)
+    core = TranslationCore(settings, None if args.no_cache else Path(args.cache), concurrency=concurrency)
+    try:
+        written, errors = translate_lines(core, read_lines(args.files), output, concurrency)
+    finally:
+        core.close()
+        sys.stdout = stdout
+        if output is not sys.stdout:
+            output.close()
+    print(f"Translated {written} lines, {errors} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def improve_command(args: argparse.Namespace) -> int:
+    settings = SettingsStore(Path(args.settings), IMPROVER_DEFAULTS)  # Read only, never saved
+    api_key = args.api_key or settings["openrouter_api_key"]
+    if not api_key:
+        print("OpenRouter API key is not set; add it in the app's settings or pass --api-key", file=sys.stderr)
+        return 2
+
+    files = find_inputs(args.paths, args.pattern or ("*.txt", "*.md"))
+    if not files:
+        print("No input files found", file=sys.stderr)
+        return 2
+
+    client = OpenRouterClient(api_key, args.model or settings["improver_model"])
+    use_cache = settings["improver_cache"] and not args.no_cache
+    cache = ImprovementCache(Path(args.cache), settings["improver_cache_max_entries"]) if use_cache else None
+    improver = BatchImprover(client, args.style or settings["writing_style"], args.tone or settings["writing_tone"],
+                             concurrency=args.concurrency, timeout=settings["improver_timeout"],
+                             log=lambda message: print(message, file=sys.stderr), cache=cache, force=args.force)
+    try:
+        improved, failed, failed_files = improver.run(files)
+    finally:
+        if cache:
+            cache.close()
+    print(f"Improved {improved} paragraphs in {len(files) - failed_files} files, {failed} failed", file=sys.stderr)
+    if failed_files:
+        print(f"{failed_files} files could not be read or written", file=sys.stderr)
+    return 1 if failed or failed_files else 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="screen_translator", description="Screen Translator command line")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    translate = commands.add_parser("translate", help="Translate text line by line and write JSONL")
+    translate.add_argument("files", nargs="*", help="Input files, '-' or nothing for stdin")
+    translate.add_argument("-o", "--output", help="Output file (default: stdout)")
+    translate.add_argument("--target", help="Target language code, overrides settings.json")
+    translate.add_argument("--deepl-key", help="DeepL API key, overrides settings.json ('' disables DeepL)")
+    translate.add_argument("--concurrency", type=int, default=4, help="Lines translated in parallel")
+    translate.add_argument("--settings", default="settings.json", help="Settings file of the tray app")
+    translate.add_argument("--cache", default="translation_cache.db", help="Persistent translation cache")
+    translate.add_argument("--no-cache", action="store_true", help="Don't read or write the persistent cache")
+    translate.set_defaults(handler=translate_command)
+
+    improve = commands.add_parser("improve", help="Improve the paragraphs of document files with the AI improver")
+    improve.add_argument("paths", nargs="+", help="Files or directories")
+    improve.add_argument("--pattern", action="append", help="File pattern inside directories (default: *.txt, *.md)")
+    improve.add_argument("--style", choices=["Normal", "Corporate", "Academic", "Friendly"],
+                         help="Writing style, overrides settings.json")
+    improve.add_argument("--tone", choices=["Enthusiastic", "Friendly", "Confident", "Diplomatic"],
+                         help="Tone of voice, overrides settings.json")
+    improve.add_argument("--model", help="OpenRouter model, overrides settings.json")
+    improve.add_argument("--api-key", help="OpenRouter API key, overrides settings.json")
+    improve.add_argument("--concurrency", type=int, default=2, help="Paragraphs improved in parallel")
+    improve.add_argument("--settings", default="settings.json", help="Settings file of the tray app")
+    improve.add_argument("--cache", default="improvement_cache.db", help="Improvement cache shared with the tray app")
+    improve.add_argument("--no-cache", action="store_true", help="Don't read or write the improvement cache")
+    improve.add_argument("--force", action="store_true", help="Improve again even if a paragraph is cached")
+    improve.set_defaults(handler=improve_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import re
+from typing import Iterator, List, NamedTuple, Tuple
+
+# End of a sentence: terminal punctuation, optional closing quotes/brackets, then whitespace.
+# CJK terminators are usually not followed by a space.
+SENTENCE_END = re.compile(r"[.!?…]+[\"'»”’)\]]*\s+|[。！？]+[」』”’）)]*\s*")
+CLAUSE_END = re.compile(r"[,;:]\s+|\s+[–—]\s+|[，；：、]\s*")
+LINE_BREAK = re.compile(r"\s*\n\s*")
+WORD = re.compile(r"\S+(\s*)")
+# Word ending with a full stop that doesn't end the sentence ("Dr. Smith", "U.S. Army")
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "gen", "col", "capt", "lt", "sgt",
+    "rev", "hon", "gov", "sen", "rep", "vs", "no", "nos", "vol", "fig", "figs", "approx", "dept",
+    "inc", "ltd", "co", "corp", "e.g", "i.e", "cf", "al",
+}
+INITIALS = re.compile(r"(?:[A-Za-z]\.)+[A-Za-z]?")
+# Characters after which languages written without spaces don't take a space
+CJK = re.compile("[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+# (text, whitespace that followed it)
+Piece = Tuple[str, str]
+
+
+class Segment(NamedTuple):
+    text: str
+    # Whitespace that followed the segment: the original spacing inside a line ("" after
+    # CJK punctuation), "\n" (line break), "\n\n" (paragraph) or "" at the end
+    separator: str
+
+
+def _is_abbreviation(line: str, end: int) -> bool:
+    """Whether the full stop just before ``end`` belongs to an abbreviation"""
+    words = line[:end].split()
+    word = words[-1].lstrip("(\"'«“‘[") if words else ""
+    if not word.endswith("."):
+        return False
+    word = word[:-1]
+    return word.lower() in ABBREVIATIONS or INITIALS.fullmatch(word) is not None
+
+
+def _split_sentences(line: str) -> List[Piece]:
+    sentences: List[Piece] = []
+    start = 0
+    for match in SENTENCE_END.finditer(line):
+        following = line[match.end():match.end() + 1]
+        if following and (following.islower() or following.isdigit()):
+            continue
+        terminator = match.group().rstrip()
+        if terminator == "." and following and _is_abbreviation(line, match.start() + 1):
+            continue
+        sentence = line[start:match.end()].strip()
+        if sentence:
+            sentences.append((sentence, match.group()[len(terminator):]))
+        start = match.end()
+    rest = line[start:].strip()
+    if rest:
+        sentences.append((rest, ""))
+    return sentences
+
+
+def split_sentences(line: str) -> List[str]:
+    """
+    Split a line into sentences. A full stop followed by a lowercase letter or a digit
+    is treated as part of an abbreviation ("e.g. this", "No. 5") and doesn't split,
+    and neither do common abbreviations and initials ("Dr. Smith", "U.S. Army").
+    """
+    return [sentence for sentence, _ in _split_sentences(line)]
+
+
+def _pieces(sentence: str, pattern: "re.Pattern") -> List[Piece]:
+    pieces: List[Piece] = []
+    start = 0
+    for match in pattern.finditer(sentence):
+        piece = sentence[start:match.end()]
+        pieces.append((piece.strip(), piece[len(piece.rstrip()):]))
+        start = match.end()
+    pieces.append((sentence[start:].strip(), ""))
+    return [piece for piece in pieces if piece[0]]
+
+
+def _words(clause: str, max_chars: int) -> List[Piece]:
+    """Split between words; text without spaces (CJK) is cut every ``max_chars`` characters"""
+    pieces: List[Piece] = []
+    for match in WORD.finditer(clause):
+        word = match.group().rstrip()
+        cuts = range(0, len(word), max_chars)
+        pieces.extend((word[i:i + max_chars], "" if i + max_chars < len(word) else match.group(1))
+                      for i in cuts)
+    return pieces
+
+
+def _merge(pieces: List[Piece], max_chars: int) -> List[Piece]:
+    """Join consecutive pieces, with their original spacing, as long as they stay within the budget"""
+    merged: List[Piece] = []
+    for text, space in pieces:
+        if merged and len(merged[-1][0]) + len(merged[-1][1]) + len(text) <= max_chars:
+            merged[-1] = (merged[-1][0] + merged[-1][1] + text, space)
+        else:
+            merged.append((text, space))
+    return merged
+
+
+def _fit_to_budget(sentence: str, space: str, max_chars: int) -> List[Piece]:
+    if len(sentence) <= max_chars:
+        return [(sentence, space)]
+    pieces: List[Piece] = []
+    for clause, clause_space in _pieces(sentence, CLAUSE_END):
+        pieces.extend([(clause, clause_space)] if len(clause) <= max_chars else _words(clause, max_chars))
+        pieces[-1] = (pieces[-1][0], clause_space)
+    merged = _merge(pieces, max_chars)
+    merged[-1] = (merged[-1][0], space)
+    return merged
+
+
+def fit_to_budget(sentence: str, max_chars: int) -> List[str]:
+    """A sentence over the budget is cut at clause boundaries, then between words (or characters)"""
+    return [text for text, _ in _fit_to_budget(sentence, "", max_chars)]
+
+
+def _lines(text: str) -> Iterator[tuple]:
+    parts = LINE_BREAK.split(text.strip())
+    breaks = LINE_BREAK.findall(text.strip()) + [""]
+    for line, line_break in zip(parts, breaks):
+        yield line, "\n\n" if line_break.count("\n") > 1 else ("\n" if line_break else "")
+
+
+def segment_text(text: str, max_chars: int = 300) -> List[Segment]:
+    """
+    Split a selection into sentence segments that are translated (and cached) one by one.
+    Sentences longer than ``max_chars`` are split at clause boundaries and the clauses
+    merged back up to the budget. Line and paragraph breaks are kept as separators.
+    """
+    segments: List[Segment] = []
+    for line, line_break in _lines(text):
+        pieces = [piece for sentence, space in _split_sentences(line)
+                  for piece in _fit_to_budget(sentence, space, max_chars)]
+        for i, (piece, space) in enumerate(pieces):
+            segments.append(Segment(piece, space if i < len(pieces) - 1 else line_break))
+    return segments
+
+
+def join_segments(segments: List[Segment], texts: List[str]) -> str:
+    """
+    Reassemble per-segment texts (e.g. translations) with the original breaks. Spacing
+    inside a line is dropped after text ending in CJK, so a Chinese or Japanese
+    translation of spaced source text doesn't get spaces between its sentences.
+    """
+    parts = []
+    for segment, text in zip(segments, texts):
+        separator = segment.separator
+        if separator and "\n" not in separator and text and CJK.match(text[-1]):
+            separator = ""
+        parts.append(text + separator)
+    return "".join(parts)
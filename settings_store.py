@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+import threading
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+
+def coerce_setting(expected: type, value: Any) -> Any:
+    """Convert a value to the type of the setting's default, or raise TypeError"""
+    if isinstance(value, expected) and (expected is bool or not isinstance(value, bool)):
+        return value
+    if expected is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if expected is int and isinstance(value, float) and value.is_integer():
+        return int(value)
+    raise TypeError(f"expected {expected.__name__}, got {type(value).__name__}")
+
+
+class SettingsStore(MutableMapping):
+    """
+    Typed, observable, dict-like settings that are written to disk in batches.
+
+    Every key has the type of its default value; assignments are converted or rejected.
+    subscribe_key() registers a callback for specific keys, so each subsystem only
+    reacts to the settings it depends on.
+
+    save() only schedules a write: changes made within ``save_delay`` seconds are
+    collected and written once on a background thread, atomically (temp file + rename),
+    so dragging a spinbox no longer rewrites the file dozens of times and a crash
+    can't leave a half-written settings.json behind.
+    """
+
+    def __init__(self, path: Path, defaults: Dict[str, Any], save_delay: float = 0.5):
+        self.path = Path(path)
+        self.save_delay = save_delay
+        self._values: Dict[str, Any] = dict(defaults)
+        self._types: Dict[str, type] = {key: type(value) for key, value in defaults.items()}
+        self._key_subscribers: Dict[str, List[Callable[[str, Any], None]]] = {}
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._subscribers: List[Callable[[Set[str]], None]] = []
+        self.load()
+
+    def load(self):
+        try:
+            if not self.path.exists():
+                return
+            for key, value in json.loads(self.path.read_text('utf-8')).items():
+                try:
+                    self._values[key] = self._coerce(key, value)
+                except TypeError as e:
+                    print(f"Ignoring setting {key}: {e}")
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+
+    def _coerce(self, key: str, value: Any) -> Any:
+        expected = self._types.get(key)
+        return value if expected is None else coerce_setting(expected, value)
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            return self._values[key]
+
+    def __setitem__(self, key: str, value: Any):
+        try:
+            value = self._coerce(key, value)
+        except TypeError as e:
+            raise TypeError(f"Invalid value for setting {key}: {e}") from None
+        with self._lock:
+            if key in self._values and self._values[key] == value:
+                return
+            self._values[key] = value
+            self._dirty = True
+        self._notify({key})
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            del self._values[key]
+            self._dirty = True
+        self._notify({key})
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._values))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def subscribe(self, callback: Callable[[Set[str]], None]):
+        """Call ``callback(changed_keys)`` after every change"""
+        self._subscribers.append(callback)
+
+    def subscribe_key(self, keys: Union[str, Iterable[str]], callback: Callable[[str, Any], None]):
+        """Call ``callback(key, new_value)`` whenever one of the given keys changes"""
+        for key in [keys] if isinstance(keys, str) else keys:
+            self._key_subscribers.setdefault(key, []).append(callback)
+
+    def _notify(self, keys: Set[str]):
+        for key in keys:
+            for callback in list(self._key_subscribers.get(key, ())):
+                callback(key, self._values.get(key))
+        for callback in list(self._subscribers):
+            callback(keys)
+
+    def save(self):
+        """Schedule a write of the pending changes"""
+        with self._lock:
+            if not self._dirty or self._timer is not None:
+                return
+            self._timer = threading.Timer(self.save_delay, self._write)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes now, e.g. before the application exits"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self._write()
+
+    def _write(self):
+        with self._write_lock:
+            with self._lock:
+                self._timer = None
+                if not self._dirty:
+                    return
+                snapshot = dict(self._values)
+                self._dirty = False
+            try:
+                data = json.dumps(snapshot, indent=4, ensure_ascii=False)
+                fd, tmp_path = tempfile.mkstemp(prefix=self.path.name, suffix=".tmp",
+                                                dir=self.path.parent.resolve())
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                        tmp_file.write(data)
+                        tmp_file.flush()
+                        os.fsync(tmp_file.fileno())
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except Exception as e:
+                print(f"Error saving settings: {e}")
+                with self._lock:
+                    self._dirty = True
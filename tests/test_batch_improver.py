@@ -0,0 +1,50 @@
+from batch_improver import BatchImprover, checkpoint_path, find_inputs, output_path, split_paragraphs
+
+ENGLISH = "The weather is nice today and we walk in the park with our friends."
+SECOND = "We like to read books in the evening when the house is quiet."
+
+
+class FakeClient:
+    """Stands in for OpenRouterClient; 'improves' by returning the text unchanged"""
+    model = "test/model"
+
+    def __init__(self):
+        self.requests = []
+
+    def complete(self, system_message, text, on_token=None, cancel_event=None, timeout=None):
+        self.requests.append(text)
+        return text
+
+
+def make_improver(client, **options):
+    return BatchImprover(client, "Academic", "Confident", concurrency=2, log=lambda message: None, **options)
+
+
+def test_split_paragraphs():
+    assert split_paragraphs(f"\n{ENGLISH}\n\n \n{SECOND}\n") == [ENGLISH, SECOND]
+
+
+def test_unreadable_file_does_not_stop_the_batch(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"\xff\xfe broken \xc3\x28 latin-1 \xe9")
+    (tmp_path / "b.txt").write_text(f"{ENGLISH}\n\n{SECOND}\n", encoding="utf-8")
+    files = find_inputs([str(tmp_path)]) + [tmp_path / "missing.txt"]
+
+    improved, failed, failed_files = make_improver(FakeClient()).run(files)
+
+    assert (improved, failed, failed_files) == (2, 0, 2)
+    assert output_path(tmp_path / "b.txt").read_text(encoding="utf-8") == f"{ENGLISH}\n\n{SECOND}\n"
+    assert not output_path(tmp_path / "a.txt").exists()
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    source = tmp_path / "notes.md"
+    source.write_text(f"{ENGLISH}\n\n{SECOND}\n", encoding="utf-8")
+    client = FakeClient()
+    improver = make_improver(client)
+    with open(checkpoint_path(source), "w", encoding="utf-8") as checkpoint:
+        checkpoint.write('{"key": "%s", "improved": "Done before."}\n{"key": "trunc' % improver.paragraph_key(ENGLISH))
+
+    assert improver.process_file(source) == (2, 0)
+    assert client.requests == [SECOND]
+    assert output_path(source).read_text(encoding="utf-8") == f"Done before.\n\n{SECOND}\n"
+    assert not checkpoint_path(source).exists()
@@ -0,0 +1,54 @@
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ProviderHealth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail():
+    raise ConnectionError("down")
+
+
+def test_opens_after_threshold_and_recovers_through_probe():
+    clock = Clock()
+    breaker = CircuitBreaker("DeepL", failure_threshold=2, base_delay=10, jitter=0, clock=clock)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+    clock.now = 10
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_doubles_backoff():
+    clock = Clock()
+    breaker = CircuitBreaker("DeepL", failure_threshold=1, base_delay=10, jitter=0, clock=clock)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    clock.now = 10
+    assert breaker.allow() and breaker.state == HALF_OPEN
+    assert not breaker.allow()  # Only one probe at a time
+    breaker.record_failure(ConnectionError("still down"))
+    assert breaker.retry_in() == 20
+
+
+def test_configure_updates_existing_breakers():
+    health = ProviderHealth(failure_threshold=3, base_delay=5.0)
+    breaker = health.breaker("DeepL")
+    health.configure(failure_threshold=1, base_delay=30.0)
+
+    assert (breaker.failure_threshold, breaker.base_delay) == (1, 30.0)
+    assert health.breaker("Google").failure_threshold == 1
+    with pytest.raises(ConnectionError):
+        health.guard("DeepL", fail)()
+    assert health.is_open("DeepL")
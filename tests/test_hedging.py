@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from hedging import HedgedCaller, LatencyHistogram
+
+
+@pytest.fixture
+def hedger():
+    hedger = HedgedCaller(default_delay=0.05, max_workers=4)
+    yield hedger
+    hedger.shutdown()
+
+
+def slow(result, seconds=0.5):
+    def call():
+        time.sleep(seconds)
+        return result
+    return call
+
+
+def fail():
+    raise ConnectionError("down")
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    for _ in range(90):
+        histogram.record(0.1)
+    for _ in range(10):
+        histogram.record(2.0)
+    assert 0.1 <= histogram.percentile(0.5) < 0.13
+    assert histogram.percentile(0.99) >= 2.0
+
+
+def test_fast_primary_wins(hedger):
+    assert hedger.call(("DeepL", lambda: "deepl"), ("Google", lambda: "google")) == ("deepl", "DeepL")
+    assert hedger.stats()["hedged"] == 0
+
+
+def test_slow_primary_is_hedged(hedger):
+    assert hedger.call(("DeepL", slow("deepl")), ("Google", lambda: "google")) == ("google", "Google")
+    assert hedger.stats()["secondary_wins"] == 1
+
+
+def test_without_hedging_secondary_is_only_a_fallback(hedger):
+    assert hedger.call(("DeepL", slow("deepl", 0.1)), ("Google", lambda: "google"), hedge=False) == ("deepl", "DeepL")
+    assert hedger.call(("DeepL", fail), ("Google", lambda: "google"), hedge=False) == ("google", "Google")
+
+
+def test_invalid_primary_falls_back(hedger):
+    is_valid = lambda result: result is not None and len(result) == 2
+    assert hedger.call(("DeepL", lambda: ["a"]), ("Google", lambda: ["a", "b"]), is_valid) == (["a", "b"], "Google")
+
+
+def test_all_failing_raises_last_error(hedger):
+    with pytest.raises(ConnectionError):
+        hedger.call(("DeepL", fail), ("Google", fail))
@@ -0,0 +1,37 @@
+from improvement_cache import ImprovementCache, make_improvement_key
+
+
+def key(text, model="model", style="Academic", tone="Confident", version=1):
+    return make_improvement_key(model, style, tone, version, text)
+
+
+def test_key_normalizes_text_and_separates_options():
+    assert key("Some  text \r\n") == key("Some text")
+    assert key("Some text") != key("Some text", tone="Friendly")
+    assert key("Some text") != key("Some text", version=2)
+
+
+def test_get_put_and_persistence(tmp_path):
+    cache = ImprovementCache(tmp_path / "cache.db")
+    assert cache.get(key("a")) is None
+    cache.put(key("a"), "A")
+    assert cache.get(key("a")) == "A"
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+    cache.close()
+
+    reopened = ImprovementCache(tmp_path / "cache.db")
+    assert reopened.get(key("a")) == "A"
+    reopened.close()
+
+
+def test_size_is_bounded_on_every_put(tmp_path):
+    cache = ImprovementCache(tmp_path / "cache.db", max_entries=5)
+    for i in range(45):
+        cache.put(key(str(i)), str(i))
+        assert cache.stats()["size"] <= 5
+    assert cache.get(key("44")) == "44"
+    assert cache.get(key("0")) is None
+
+    cache.set_max_entries(2)
+    assert cache.stats()["size"] == 2
+    cache.close()
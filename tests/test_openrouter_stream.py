@@ -0,0 +1,58 @@
+import sys
+import threading
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+import pytest
+import requests
+
+from improver_core import OpenRouterClient
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from stub_server import start_stub_server  # noqa: E402
+
+
+@pytest.fixture
+def stream_client():
+    servers = []
+
+    def make(**options):
+        server = start_stub_server(token_delay=0.001, **options)
+        servers.append(server)
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions"
+        return OpenRouterClient("key", "model", session_factory=requests.Session, api_url=url)
+
+    yield make
+    for server in servers:
+        server.shutdown()
+
+
+def test_tokens_accumulate_until_done(stream_client):
+    client = stream_client()
+    reports = []
+    assert client.complete("system", "text", reports.append) == "This is a streamed stub response."
+    assert reports[0] == "This "
+    assert reports[-1] == "This is a streamed stub response."
+    assert all(later.startswith(earlier) for earlier, later in zip(reports, reports[1:]))
+    assert client.last_time_to_first_token is not None
+
+
+def test_updates_are_throttled(stream_client):
+    client = stream_client(stream_tokens=["token "] * 50)
+    client.TOKEN_INTERVAL = 10.0
+    reports = []
+    client.complete("system", "text", reports.append)
+    assert reports == ["token ", "token " * 50]
+
+
+def test_error_event_raises(stream_client):
+    client = stream_client(stream_error="Provider returned error")
+    with pytest.raises(ValueError, match="Provider returned error"):
+        client.complete("system", "text", lambda content: None)
+
+
+def test_cancel_event_stops_the_stream(stream_client):
+    client = stream_client()
+    cancel_event = threading.Event()
+    with pytest.raises(CancelledError):
+        client.complete("system", "text", lambda content: cancel_event.set(), cancel_event=cancel_event)
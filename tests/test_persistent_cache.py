@@ -0,0 +1,28 @@
+from translation_cache import PersistentTranslationCache, make_cache_key
+
+
+def key(text, provider="deepl"):
+    return make_cache_key(provider, "auto", "DE", text)
+
+
+def test_persistent_cache_expiry_and_warm_start(tmp_path):
+    cache = PersistentTranslationCache(tmp_path / "cache.db", ttl_seconds=60)
+    cache.put_many([(key("a"), "A"), (key("b"), "B")])
+    assert cache.get(key("a")) == "A"
+    assert [entry for _, entry in cache.load_recent(10)] == ["B", "A"]
+    cache.close()
+
+    expired = PersistentTranslationCache(tmp_path / "cache.db", ttl_seconds=0)
+    assert expired.get(key("a")) is None
+    expired.close()
+
+
+def test_persistent_cache_never_exceeds_max_entries(tmp_path):
+    cache = PersistentTranslationCache(tmp_path / "cache.db", max_entries=3)
+    for text in "abcde":
+        cache.put(key(text), text.upper())
+        assert cache.get(key(text)) == text.upper()
+        assert cache._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] <= 3
+    assert cache.get(key("a")) is None
+    assert cache.get(key("e")) == "E"
+    cache.close()
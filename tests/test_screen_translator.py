@@ -0,0 +1,28 @@
+import io
+import json
+
+from screen_translator import read_lines, translate_lines
+
+
+class EchoCore:
+    def translate(self, text):
+        return text.upper()
+
+
+def test_unreadable_files_are_reported_and_skipped(tmp_path):
+    good = tmp_path / "good.txt"
+    good.write_text("one\n\ntwo\n", encoding="utf-8")
+    latin1 = tmp_path / "latin1.txt"
+    latin1.write_bytes("caf\xe9\n".encode("latin-1"))
+    missing = tmp_path / "missing.txt"
+
+    output = io.StringIO()
+    paths = [str(missing), str(latin1), str(good)]
+    written, errors = translate_lines(EchoCore(), read_lines(paths), output, concurrency=2)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert (written, errors) == (4, 2)
+    assert [record["source"] for record in records] == [str(missing), str(latin1), str(good), str(good)]
+    assert all(record["error"] and record["text"] is None for record in records[:2])
+    assert [record["translation"] for record in records[2:]] == ["ONE", "TWO"]
+    assert [record["line"] for record in records[2:]] == [1, 3]
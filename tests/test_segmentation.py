@@ -0,0 +1,46 @@
+import pytest
+
+from segmentation import fit_to_budget, join_segments, segment_text, split_sentences
+
+
+@pytest.mark.parametrize("text", [
+    "这是第一句。这是第二句！第三句？",
+    "これは最初の文です。「次の文」。最後の文！",
+    "First sentence.  Second one!\nNew line here.\n\nNew paragraph? Yes.",
+    "这是一个很长的句子，" * 40,
+])
+def test_join_round_trips_source_spacing(text):
+    segments = segment_text(text, max_chars=50)
+    assert join_segments(segments, [segment.text for segment in segments]) == text.strip()
+
+
+def test_cjk_segments_have_no_space_separator():
+    segments = segment_text("这是第一句。这是第二句！")
+    assert [segment.separator for segment in segments] == ["", ""]
+
+
+def test_cjk_translation_of_spaced_text_is_joined_without_spaces():
+    segments = segment_text("This is one. This is two!\nThird line.")
+    joined = join_segments(segments, ["这是第一句。", "这是第二句！", "第三行。"])
+    assert joined == "这是第一句。这是第二句！\n第三行。"
+
+
+def test_spaceless_text_is_cut_to_budget():
+    pieces = fit_to_budget("我们" * 200, 50)
+    assert "".join(pieces) == "我们" * 200
+    assert max(map(len, pieces)) == 50
+
+
+def test_clauses_are_merged_up_to_budget():
+    assert fit_to_budget("Long sentence one, with clauses here; and more clauses – yes indeed.", 30) == [
+        "Long sentence one,", "with clauses here;", "and more clauses – yes indeed."
+    ]
+
+
+@pytest.mark.parametrize("line, sentences", [
+    ("Dr. Smith joined the U.S. Army. He left.", ["Dr. Smith joined the U.S. Army.", "He left."]),
+    ("See e.g. this one. And No. 5 too.", ["See e.g. this one.", "And No. 5 too."]),
+    ("It works! Does it? Yes… It does.", ["It works!", "Does it?", "Yes…", "It does."]),
+])
+def test_split_sentences(line, sentences):
+    assert split_sentences(line) == sentences
@@ -0,0 +1,20 @@
+from translation_cache import TranslationCache, make_cache_key
+
+
+def key(text, provider="deepl"):
+    return make_cache_key(provider, "auto", "DE", text)
+
+
+def test_key_normalizes_text_and_language_case():
+    assert key("Hello \t world\r\n") == make_cache_key("deepl", "auto", "de", "Hello world")
+    assert key("Hello") != key("Hello", "google")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TranslationCache(max_entries=2)
+    cache.put(key("a"), "A")
+    cache.put(key("b"), "B")
+    assert cache.get(key("a")) == "A"  # "b" is now the oldest
+    cache.put(key("c"), "C")
+    assert key("b") not in cache
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 0, "evictions": 1}
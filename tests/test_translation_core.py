@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from translation_core import TRANSLATION_DEFAULTS, TranslationCore
+
+
+@pytest.fixture
+def core(tmp_path):
+    settings = dict(TRANSLATION_DEFAULTS, use_deepl=True, deepl_api_key="key", target_lang="de")
+    core = TranslationCore(settings, tmp_path / "cache.db")
+    core.hedger.default_delay = 0.01  # Hedge right away
+    yield core
+    core.close()
+
+
+def slow_deepl(texts):
+    time.sleep(0.3)
+    return [f"deepl:{text}" for text in texts]
+
+
+def test_hedged_google_answer_is_not_cached_as_deepl(core):
+    core.translate_with_deepl = slow_deepl
+    core.translate_with_google = lambda text: f"google:{text}"
+
+    assert core.request_translation("Hello") == "google:Hello"
+    assert core.get_cached("Hello") is None
+    assert core.persistent_cache.get(core.cache_key("Hello", "google")) == "google:Hello"
+
+
+def test_hedged_batch_is_cached_under_the_winner(core):
+    core.translate_with_deepl = slow_deepl
+    core.translate_joined_with_google = lambda texts: [f"google:{text}" for text in texts]
+
+    translations, provider = core.translate_batch_with_provider(["One.", "Two."])
+    assert translations == ["google:One.", "google:Two."]
+    assert provider == "google"
+    assert core.get_cached("One.") is None
+    assert core.translator_cache.get(core.cache_key("Two.", "google")) == "google:Two."
+
+
+def test_primary_answer_is_cached_under_current_provider(core):
+    core.hedger.default_delay = 1.0
+    core.translate_with_deepl = lambda texts: [f"deepl:{text}" for text in texts]
+    core.translate_with_google = lambda text: f"google:{text}"
+
+    assert core.request_translation("Hello") == "deepl:Hello"
+    assert core.get_cached("Hello") == "deepl:Hello"
+
+
+def test_google_entries_are_read_while_deepl_is_open(core):
+    core.put_cached("Hello", "google:Hello", "google")
+    assert core.get_cached("Hello") is None
+
+    breaker = core.health.breaker("DeepL")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(RuntimeError("down"))
+    assert core.get_cached("Hello") == "google:Hello"
+    assert core.translate_batch_with_provider(["Hello"]) == (["google:Hello"], "google")
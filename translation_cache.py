@@ -0,0 +1,246 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (provider, source_lang, target_lang, text_hash)
+CacheKey = Tuple[str, str, str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a selection so that trivially different copies share a cache entry"""
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n")
+    return re.sub(r"[ \t]+", " ", text).strip()
+
+
+def make_cache_key(provider: str, source_lang: str, target_lang: str, text: str) -> CacheKey:
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return provider, source_lang, target_lang.lower(), text_hash
+
+
+class TranslationCache:
+    """
+    Thread-safe in-memory LRU cache. Lookups, inserts and evictions are O(1);
+    a hit moves the entry to the most recently used end so hot phrases stay cached.
+    """
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: CacheKey, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def update(self, items: Iterable[Tuple[CacheKey, str]]):
+        for key, value in items:
+            self.put(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey):
+        return key in self._entries
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same cache key into one: the first caller runs
+    the request, callers arriving while it is in flight wait for and share its result
+    (or exception). Fills the gap until the result lands in the cache.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.collapsed = 0
+
+    def do(self, key: CacheKey, func: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.executed += 1
+            else:
+                self.collapsed += 1
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result()
+
+    def record_collapsed(self, count: int):
+        """Count duplicates that were merged by the caller, e.g. identical chunks in one batch"""
+        with self._lock:
+            self.collapsed += count
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "executed": self.executed,
+                "collapsed": self.collapsed
+            }
+
+
+class PersistentTranslationCache:
+    """
+    SQLite backed translation cache that survives restarts.
+
+    Entries expire after ``ttl_seconds`` and every write trims the table to
+    ``max_entries`` by evicting the least recently used rows.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 20000, ttl_seconds: float = 30 * 24 * 3600):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.closed = False  # Translations still finishing after close() neither read nor write
+        # Used from translation worker threads, access is serialized by the lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                provider TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (provider, source_lang, target_lang, text_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_accessed ON translations (accessed_at)")
+        self._conn.commit()
+        self.purge_expired()
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            if self.closed:
+                return None
+            row = self._conn.execute(
+                "SELECT translation, created_at FROM translations "
+                "WHERE provider = ? AND source_lang = ? AND target_lang = ? AND text_hash = ?",
+                key
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM translations "
+                    "WHERE provider = ? AND source_lang = ? AND target_lang = ? AND text_hash = ?",
+                    key
+                )
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE translations SET accessed_at = ? "
+                "WHERE provider = ? AND source_lang = ? AND target_lang = ? AND text_hash = ?",
+                (now, *key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: CacheKey, translation: str):
+        self.put_many([(key, translation)])
+
+    def put_many(self, items: Iterable[Tuple[CacheKey, str]]):
+        now = time.time()
+        rows = [(*key, translation, now, now) for key, translation in items]
+        if not rows:
+            return
+        with self._lock:
+            if self.closed:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations "
+                "(provider, source_lang, target_lang, text_hash, translation, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict_overflow()
+            self._conn.commit()
+
+    def load_recent(self, limit: int) -> List[Tuple[CacheKey, str]]:
+        """Most recently used entries, newest last, for warming the in-memory cache"""
+        with self._lock:
+            if self.closed:
+                return []
+            rows = self._conn.execute(
+                "SELECT provider, source_lang, target_lang, text_hash, translation FROM translations "
+                "WHERE created_at >= ? ORDER BY accessed_at DESC LIMIT ?",
+                (time.time() - self.ttl_seconds, limit)
+            ).fetchall()
+        return [((row[0], row[1], row[2], row[3]), row[4]) for row in reversed(rows)]
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self._evict_overflow()
+            self._conn.commit()
+
+    def _evict_overflow(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN "
+                "(SELECT rowid FROM translations ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            self._conn.close()
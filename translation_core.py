@@ -0,0 +1,341 @@
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, List, MutableMapping, Optional, Tuple
+
+from circuit_breaker import ProviderHealth
+from hedging import HedgedCaller
+from language_detection import is_language
+from providers import ProviderRegistry
+from segmentation import Segment, join_segments, segment_text
+from translation_cache import CacheKey, PersistentTranslationCache, SingleFlight, TranslationCache, make_cache_key
+
+# Settings used by the translation pipeline, shared by the tray app and the command line
+TRANSLATION_DEFAULTS = {
+    "target_lang": "tr",
+    "use_deepl": False,
+    "deepl_api_key": "",  # New setting for DeepL API key
+    "show_translation_details": True,
+    "progressive_details": True,  # Detaylı çeviride satırları geldikçe göster
+    "max_parallel_chunks": 4,  # Aynı anda gönderilecek en fazla parça isteği
+    "batch_details": True,  # Tüm parçaları tek istekte çevir
+    "persistent_cache": True,  # Çevirileri yeniden başlatmalar arasında sakla
+    "cache_max_entries": 20000,
+    "cache_ttl_days": 30,
+    "hedge_requests": True,  # DeepL yavaşsa Google'ı da gönder, ilk gelen cevabı kullan
+    "hedge_percentile": 0.95,  # DeepL gecikmesinin bu yüzdeliğini aşınca Google devreye girer
+    "breaker_failures": 3,  # Art arda bu kadar hatadan sonra sağlayıcı geçici olarak atlanır
+    "breaker_backoff": 5.0,  # İlk bekleme süresi (saniye), her yeni hatada iki katına çıkar
+    "segment_max_chars": 300,  # Bir parçanın (cümle grubu) en fazla karakter sayısı
+    "incremental_translation": True  # Uzun metinlerde sadece önbellekte olmayan cümleleri çevir
+}
+
+
+class TranslationCore:
+    """
+    The translation pipeline without any UI: caches, provider clients, hedging, circuit
+    breakers and segmentation. Thread-safe; used by the tray app's worker threads and
+    by the command line (screen_translator.py).
+    """
+    CACHE_LIMIT = 500  # Sabit cache limiti
+    # Sentinel line used to send several chunks to Google in a single request
+    BATCH_SEPARATOR = "\n||\n"
+    BATCH_SPLIT_PATTERN = re.compile(r"\s*\|\s*\|\s*")
+    GOOGLE_BATCH_CHARS = 4500  # Google rejects requests above 5000 characters
+    # Hedger request names -> provider part of the cache key
+    PROVIDER_KEYS = {"DeepL": "deepl", "DeepL batch": "deepl", "Google": "google", "Google batch": "google"}
+
+    def __init__(self, settings: MutableMapping[str, Any], cache_file: Optional[Path] = Path("translation_cache.db"),
+                 concurrency: Optional[int] = None):
+        """
+        concurrency: number of threads that call into the core at the same time, when
+        more than max_parallel_chunks (e.g. the CLI's --concurrency workers)
+        """
+        self.settings = settings
+        self.cache_file = cache_file
+        # LRU cache keyed by provider, languages and text; shared by translation worker threads
+        self.translator_cache = TranslationCache(self.CACHE_LIMIT)
+        self.in_flight = SingleFlight()  # Identical requests running at the same time share one call
+        self.setup_persistent_cache()
+        self.providers = ProviderRegistry()  # Reused translation clients and HTTP connections
+
+        # Detail mode chunks are translated in parallel with a bounded number of requests
+        self.chunk_pool = ThreadPoolExecutor(max_workers=max(1, int(self.settings["max_parallel_chunks"])))
+
+        # Provider calls go through the hedger, which tracks latencies and races DeepL against Google.
+        # A hedged request can occupy two workers (primary and secondary) per calling thread.
+        callers = max(1, int(self.settings["max_parallel_chunks"]), concurrency or 0)
+        self.hedger = HedgedCaller(self.settings["hedge_percentile"], max_workers=2 * callers)
+
+        # A provider that keeps failing is skipped until its backoff has passed
+        self.health = ProviderHealth(failure_threshold=self.settings["breaker_failures"],
+                                     base_delay=self.settings["breaker_backoff"])
+
+    def setup_persistent_cache(self):
+        self.persistent_cache = None
+        if not self.settings["persistent_cache"] or self.cache_file is None:
+            return
+        try:
+            self.persistent_cache = PersistentTranslationCache(
+                self.cache_file,
+                max_entries=self.settings["cache_max_entries"],
+                ttl_seconds=self.settings["cache_ttl_days"] * 24 * 3600
+            )
+            # Warm start: most recently used translations go straight into memory
+            self.translator_cache.update(self.persistent_cache.load_recent(self.CACHE_LIMIT))
+        except Exception as e:
+            print(f"Error opening translation cache: {e}")
+            self.persistent_cache = None
+
+    def build_translation(self, text: str, is_cancelled=lambda: False,
+                          report_progress=lambda partial: None) -> Optional[str]:
+        """Runs on a worker thread; must not touch any widget"""
+        if self.settings["show_translation_details"]:
+            # Sentence segments; each one is translated and cached on its own
+            segments = segment_text(text, self.settings["segment_max_chars"])
+            chunks = [segment.text for segment in segments]
+            # Language is detected once for the whole selection, not once per chunk
+            if self.is_target_language(text):
+                return self.format_chunk_lines(segments, chunks)
+            if self.settings["batch_details"]:
+                translations = self.translate_batch(chunks)
+                if translations is not None:
+                    return self.format_chunk_lines(segments, translations)
+                if is_cancelled():
+                    return None
+            return self.translate_chunks(segments, is_cancelled, report_progress)
+        return self.translate(text)
+
+    def translate(self, text: str) -> Optional[str]:
+        """Plain translation of a selection; incremental when enabled"""
+        if self.settings["incremental_translation"]:
+            return self.translate_incremental(text)
+        return self.translate_text(text)
+
+    def translate_incremental(self, text: str) -> Optional[str]:
+        """
+        Translate a selection segment by segment, so segments seen in an earlier
+        selection come from the cache and only new ones are sent (in one request).
+        """
+        cached = self.get_cached(text)
+        if cached is not None:
+            return cached
+        if self.is_target_language(text):
+            return text
+
+        segments = segment_text(text, self.settings["segment_max_chars"])
+        if len(segments) <= 1:
+            return self.translate_text(text, check_language=False)
+
+        translations, provider = self.translate_batch_with_provider([segment.text for segment in segments])
+        if translations is None:
+            # Segments couldn't be mapped back, translate the selection as a whole
+            return self.translate_text(text, check_language=False)
+
+        translation = join_segments(segments, translations)
+        self.put_cached(text, translation, provider)
+        return translation
+
+    def translate_chunks(self, segments: List[Segment], is_cancelled=lambda: False,
+                         report_progress=lambda partial: None) -> Optional[str]:
+        """Translate segments in parallel and return "segment → translation" lines in original order"""
+        chunks = [segment.text for segment in segments]
+        futures = {self.chunk_pool.submit(self.translate_text, chunk, False): i for i, chunk in enumerate(chunks)}
+        translations: List[Optional[str]] = [None] * len(chunks)
+        finished = [False] * len(chunks)
+        shown = 0
+        try:
+            for future in as_completed(futures):
+                if is_cancelled():
+                    return None
+                index = futures[future]
+                translations[index] = future.result()
+                finished[index] = True
+
+                if self.settings["progressive_details"]:
+                    # Only show the finished prefix so lines never jump around
+                    ready = shown
+                    while ready < len(chunks) and finished[ready]:
+                        ready += 1
+                    if shown < ready < len(chunks):
+                        shown = ready
+                        report_progress(self.format_chunk_lines(segments[:ready], translations[:ready]))
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return self.format_chunk_lines(segments, translations)
+
+    @staticmethod
+    def format_chunk_lines(segments: List[Segment], translations: List[Optional[str]]) -> str:
+        """One "segment → translation" line per segment, paragraphs separated by a blank line"""
+        lines: List[str] = []
+        for segment, translation in zip(segments, translations):
+            if translation:
+                lines.append(f"{segment.text} → {translation}")
+            if segment.separator == "\n\n" and lines and lines[-1]:
+                lines.append("")
+        return "\n".join(lines).strip("\n")
+
+    def is_target_language(self, text: str) -> bool:
+        try:
+            return is_language(text, self.settings["target_lang"])
+        except Exception as e:
+            print(f"Language detection error: {e}")
+            return False
+
+    def translate_text(self, text: str, check_language: bool = True) -> Optional[str]:
+        cached = self.get_cached(text)
+        if cached is not None:
+            return cached
+
+        try:
+            # Only detect language if needed
+            if check_language and is_language(text, self.settings["target_lang"]):
+                return text
+
+            return self.in_flight.do(self.cache_key(text), lambda: self.request_translation(text))
+        except Exception as e:
+            print(f"Translation error: {e}")
+            return None
+
+    def request_translation(self, text: str) -> str:
+        google = ("Google", self.health.guard("Google", lambda: self.translate_with_google(text)))
+        if self.current_provider() == "deepl" and not self.health.is_open("DeepL"):
+            # Google is the fallback if DeepL fails, and also races a slow DeepL when hedging is on
+            deepl = ("DeepL", self.health.guard("DeepL", lambda: self.translate_with_deepl([text])[0]))
+            translation, winner = self.hedger.call(deepl, google, hedge=self.settings["hedge_requests"])
+        else:
+            translation, winner = self.hedger.call(google)
+
+        # Cached under the provider that actually answered, so a Google fallback never
+        # ends up as the DeepL translation
+        self.put_cached(text, translation, self.PROVIDER_KEYS[winner])
+        return translation
+
+    def translate_batch(self, chunks: List[str]) -> Optional[List[str]]:
+        """
+        Translate all chunks of a selection with as few requests as possible.
+        The caller has already checked that the selection is not in the target language.
+        Returns None when the batched result can't be mapped back to the chunks,
+        in which case the caller falls back to per-chunk requests.
+        """
+        return self.translate_batch_with_provider(chunks)[0]
+
+    def translate_batch_with_provider(self, chunks: List[str]) -> Tuple[Optional[List[str]], str]:
+        """translate_batch, plus the cache provider key of the translations that were sent"""
+        cached = [self.lookup_cached(chunk) for chunk in chunks]
+        translations: List[Optional[str]] = [translation for translation, _ in cached]
+        missing = [i for i, translation in enumerate(translations) if translation is None]
+        # Some chunks came from Google's entries while DeepL is down
+        from_fallback = any(translation is not None and provider != self.current_provider()
+                            for translation, provider in cached)
+        if not missing:
+            return translations, "google" if from_fallback else self.current_provider()
+
+        try:
+            # Identical chunks are sent once
+            pending = list(dict.fromkeys(chunks[i] for i in missing))
+            self.in_flight.record_collapsed(len(missing) - len(pending))
+            google = ("Google batch", self.health.guard("Google", lambda: self.translate_joined_with_google(pending)))
+            is_valid = lambda results: results is not None and len(results) == len(pending)
+            if self.current_provider() == "deepl" and not self.health.is_open("DeepL"):
+                deepl = ("DeepL batch", self.health.guard("DeepL", lambda: self.translate_with_deepl(pending)))
+                results, winner = self.hedger.call(deepl, google, is_valid, hedge=self.settings["hedge_requests"])
+            else:
+                results, winner = self.hedger.call(google)
+        except Exception as e:
+            print(f"Batch translation error: {e}")
+            return None, self.current_provider()
+
+        if results is None or len(results) != len(pending):
+            return None, self.current_provider()
+
+        translated = dict(zip(pending, results))
+        for i in missing:
+            translations[i] = translated[chunks[i]]
+        self.put_cached_many(list(translated.items()), self.PROVIDER_KEYS[winner])
+        return translations, "google" if from_fallback else self.PROVIDER_KEYS[winner]
+
+    def translate_with_deepl(self, texts: List[str]) -> List[str]:
+        translator = self.providers.deepl(self.settings["deepl_api_key"])
+        results = translator.translate_text(texts, target_lang=self.settings["target_lang"].upper())
+        return [result.text for result in results]
+
+    def translate_with_google(self, text: str) -> str:
+        translator = self.providers.google(self.settings["target_lang"])
+        return translator.translate(text)
+
+    def translate_joined_with_google(self, texts: List[str]) -> Optional[List[str]]:
+        """
+        Google has no list endpoint, so chunks are joined with a sentinel line and the
+        result is split back. Returns None if the split doesn't line up with the input.
+        """
+        results: List[str] = []
+        for group in self.group_by_length(texts, self.GOOGLE_BATCH_CHARS):
+            translated = self.translate_with_google(self.BATCH_SEPARATOR.join(group))
+            parts = [part.strip() for part in self.BATCH_SPLIT_PATTERN.split(translated or "")]
+            if len(parts) != len(group) or not all(parts):
+                return None
+            results.extend(parts)
+        return results
+
+    @staticmethod
+    def group_by_length(texts: List[str], max_chars: int) -> List[List[str]]:
+        groups: List[List[str]] = [[]]
+        length = 0
+        for text in texts:
+            if groups[-1] and length + len(text) > max_chars:
+                groups.append([])
+                length = 0
+            groups[-1].append(text)
+            length += len(text) + 4
+        return groups
+
+    def current_provider(self) -> str:
+        return "deepl" if self.settings["use_deepl"] and self.settings["deepl_api_key"] else "google"
+
+    def cache_key(self, text: str, provider: Optional[str] = None) -> CacheKey:
+        return make_cache_key(provider or self.current_provider(), "auto", self.settings["target_lang"], text)
+
+    def get_cached(self, text: str) -> Optional[str]:
+        return self.lookup_cached(text)[0]
+
+    def lookup_cached(self, text: str) -> Tuple[Optional[str], str]:
+        """
+        Cached translation and the provider key it was found under. While DeepL's circuit
+        is open every request goes to Google, so Google's entries are served as well.
+        """
+        providers = [self.current_provider()]
+        if providers[0] == "deepl" and self.health.is_open("DeepL"):
+            providers.append("google")
+        for provider in providers:
+            key = self.cache_key(text, provider)
+            translation = self.translator_cache.get(key)
+            if translation is None and self.persistent_cache:
+                translation = self.persistent_cache.get(key)
+                if translation is not None:
+                    self.translator_cache.put(key, translation)
+            if translation is not None:
+                return translation, provider
+        return None, providers[0]
+
+    def put_cached(self, text: str, translation: str, provider: Optional[str] = None):
+        self.put_cached_many([(text, translation)], provider)
+
+    def put_cached_many(self, items: List[tuple], provider: Optional[str] = None):
+        """provider: cache key of the provider that made the translations, defaults to the current one"""
+        entries = [(self.cache_key(text, provider), translation) for text, translation in items]
+        self.translator_cache.update(entries)
+        if self.persistent_cache:
+            try:
+                self.persistent_cache.put_many(entries)
+            except Exception as e:
+                print(f"Error writing translation cache: {e}")
+
+    def close(self):
+        self.chunk_pool.shutdown(wait=False, cancel_futures=True)
+        self.hedger.shutdown()
+        self.providers.close()
+        if self.persistent_cache:
+            self.persistent_cache.close()
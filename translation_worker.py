@@ -0,0 +1,126 @@
+import threading
+from typing import Callable, Set
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _JobSignals(QObject):
+    finished = Signal(int, object)  # (job_id, result)
+    progress = Signal(int, object)  # (job_id, partial_result)
+    failed = Signal(int, str)  # (job_id, error_message)
+
+
+class _TranslationJob(QRunnable):
+    def __init__(self, job_id: int, func: Callable, args: tuple, signals: _JobSignals,
+                 is_stale: Callable[[int], bool], should_start: Callable[[int], bool]):
+        super().__init__()
+        self.job_id = job_id
+        self.func = func
+        self.args = args
+        self.signals = signals
+        self.is_stale = is_stale
+        self.should_start = should_start
+
+    def is_cancelled(self) -> bool:
+        return self.is_stale(self.job_id)
+
+    def report_progress(self, partial_result):
+        self.signals.progress.emit(self.job_id, partial_result)
+
+    def run(self):
+        # A newer clipboard change arrived before we even started
+        if not self.should_start(self.job_id):
+            return
+        try:
+            result = self.func(*self.args, is_cancelled=self.is_cancelled,
+                               report_progress=self.report_progress)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e))
+            return
+        self.signals.finished.emit(self.job_id, result)
+
+
+class TranslationExecutor(QObject):
+    """
+    Runs translation jobs on a QThreadPool and delivers results back to the GUI thread.
+
+    Only the most recently submitted job is considered current: queued jobs are dropped
+    when a new one arrives, running jobs can poll their ``is_cancelled`` callback, and
+    results of stale jobs are discarded instead of being emitted.
+    """
+    result_ready = Signal(object)  # Result of the latest job
+    progress = Signal(object)  # Partial result of the latest job
+    error = Signal(str)  # Error message of the latest job
+
+    def __init__(self, max_workers: int = 2, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self.latest_job_id = 0
+        self.dropped_jobs = 0  # Jobs superseded before their result was shown, queued ones included
+        self._queued: Set[int] = set()  # Submitted jobs that haven't started yet
+        self._lock = threading.Lock()
+
+        # Signals are emitted from worker threads, so these connections are queued
+        self._signals = _JobSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.failed.connect(self._on_failed)
+
+    def submit(self, func: Callable, *args) -> int:
+        """
+        Schedule ``func(*args, is_cancelled=..., report_progress=...)`` and return its job id.
+        Any job that is still waiting in the queue is cancelled.
+        """
+        self.latest_job_id += 1
+        self._drop_queued()
+        job = _TranslationJob(self.latest_job_id, func, args, self._signals, self.is_stale, self._should_start)
+        with self._lock:
+            self._queued.add(job.job_id)
+        self.pool.start(job)
+        return self.latest_job_id
+
+    def _drop_queued(self):
+        """Drop queued jobs that have not started yet"""
+        with self._lock:
+            self.dropped_jobs += len(self._queued)
+            self._queued.clear()
+        self.pool.clear()
+
+    def _should_start(self, job_id: int) -> bool:
+        """Called by a job as it starts; a job dropped from the queue has already been counted"""
+        with self._lock:
+            if job_id not in self._queued:
+                return False
+            self._queued.discard(job_id)
+            if self.is_stale(job_id):
+                self.dropped_jobs += 1
+                return False
+            return True
+
+    def _count_dropped(self):
+        with self._lock:
+            self.dropped_jobs += 1
+
+    def is_stale(self, job_id: int) -> bool:
+        return job_id != self.latest_job_id
+
+    def cancel_all(self):
+        """Mark every submitted job as stale."""
+        self.latest_job_id += 1
+        self._drop_queued()
+
+    def _on_finished(self, job_id: int, result):
+        if self.is_stale(job_id):
+            self._count_dropped()
+            return
+        self.result_ready.emit(result)
+
+    def _on_progress(self, job_id: int, partial_result):
+        if not self.is_stale(job_id):
+            self.progress.emit(partial_result)
+
+    def _on_failed(self, job_id: int, error_message: str):
+        if self.is_stale(job_id):
+            self._count_dropped()
+            return
+        self.error.emit(error_message)
@@ -0,0 +1,38 @@
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+from PySide6.QtCore import QThread, Signal
+
+
+class WarmupThread(QThread):
+    """
+    Primes slow first-use resources (langdetect profiles, DNS lookups, TLS connections)
+    on a low priority thread so the first hotkey press costs the same as later ones.
+
+    Tasks run in order; cancel() stops before the next task starts.
+    """
+    task_finished = Signal(str, float, str)  # (name, seconds, error message or "")
+
+    def __init__(self, tasks: List[Tuple[str, Callable[[], object]]], parent=None):
+        super().__init__(parent)
+        self.tasks = tasks
+        self.timings: Dict[str, float] = {}
+
+    def start_low_priority(self):
+        self.start(QThread.LowestPriority)
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        for name, task in self.tasks:
+            if self.isInterruptionRequested():
+                return
+            start = perf_counter()
+            error = ""
+            try:
+                task()
+            except Exception as e:
+                error = str(e)
+            elapsed = perf_counter() - start
+            self.timings[name] = elapsed
+            self.task_finished.emit(name, elapsed, error)